@@ -1,5 +1,6 @@
 __all__ = [
     'grambitcoin',
+    'grampool',
     'blockchain',
     'network',
     'wallet',
@@ -49,3 +49,37 @@ class IncorrectCreds(_BitcoinErrors):
     def __init__(self, uri):
         super().__init__(error_msg=f'RPC on {uri} is alive, but RPC credentials are incorrect.')
 
+
+class RPCError(_BitcoinErrors):
+    """
+    Daemon returned an error object for JSON-RPC call.
+    """
+    def __init__(self, code=None, message=''):
+        self.code = code
+        self.message = message
+        super().__init__(error_msg=f'{message} (code {code}).')
+
+
+# Known daemon error codes https://github.com/bitcoin/bitcoin/blob/v0.17.1/src/rpc/protocol.h
+RPC_ERRORS = {
+    -5: InvalidAddress,
+    -30: InvalidIpOrSubnet,
+}
+
+
+def error_from_rpc(error):
+    """
+    Map JSON-RPC error object to the exception instance.
+    :param error: `error` field of the daemon response
+    :return: exception from `RPC_ERRORS` if code is known, otherwise `RPCError`
+    """
+    code, message = error.get('code'), error.get('message', '')
+    exc_class = RPC_ERRORS.get(code)
+
+    if exc_class is None:
+        return RPCError(code=code, message=message)
+
+    exc = exc_class(message)
+    exc.code = code
+
+    return exc
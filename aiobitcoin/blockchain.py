@@ -1,6 +1,11 @@
 # -*- coding: utf-8 -*-
+import asyncio
+from collections import deque
+
 from .grambitcoincommon import GramBitcoinCommon
-from .bitcoinerrors import _BitcoinErrors
+from .bitcoinerrors import _BitcoinErrors, error_from_rpc
+from .tools.block import Block
+from .tools.serialize import h2b, b2h_rev
 
 
 class Blockchain(GramBitcoinCommon):
@@ -54,3 +59,154 @@ class Blockchain(GramBitcoinCommon):
         return (
             await self.call_method('getmempoolinfo')
         )['result']
+
+    async def get_block_raw(self, block_hash: str) -> bytes:
+        """
+        Requests serialized block (verbosity 0), which is several times smaller
+        than verbose JSON and much faster to decode.
+        :param block_hash: the block hash
+        :return: serialized block
+        """
+        response = await self.call_method('getblock', block_hash, 0)
+        await self._check_error(response['error'])
+
+        return h2b(response['result'])
+
+    async def get_block_obj(self, block_hash: str, include_offsets: bool = None) -> Block:
+        """
+        Requests serialized block and parses it.
+        :param block_hash: the block hash
+        :param include_offsets: set `offset_in_block` for every transaction
+        :return: `tools.block.Block` object
+        """
+        return Block.from_bin(
+            await self.get_block_raw(block_hash), include_offsets=include_offsets
+        )
+
+    async def iter_block_txs(self, block_hash: str, verbosity: int = 2):
+        """
+        Yields transactions of the block while the response is being received,
+        so the whole (tens of MB for verbosity 2) response is never decoded at once.
+        :param block_hash: the block hash
+        :param verbosity: 1 for transactions ids, 2 for transactions objects
+        :return: async generator of transactions
+        """
+        async for tx in self.call_method_stream('getblock', block_hash, verbosity, key='tx'):
+            yield tx
+
+    async def get_block_hashes(self, heights) -> list:
+        """
+        Resolves heights to hashes with one batch request.
+        :param heights: iterable of blocks heights
+        :return: list of blocks hashes
+        """
+        responses = await self.call_batch([('getblockhash', (height,)) for height in heights])
+
+        for response in responses:
+            if response['error']:
+                raise error_from_rpc(response['error'])
+
+        return [response['result'] for response in responses]
+
+    async def iter_blocks(self, start: int, stop: int, concurrency: int = 4, prefetch: int = 16,
+                          hashes_batch_size: int = 500, include_offsets: bool = None):
+        """
+        Yields blocks from `start` to `stop` (not included) height strictly in height order.
+        Hashes are resolved with batch requests, blocks are fetched concurrently and
+        at most `prefetch` blocks are requested ahead of the consumer.
+        :param start: height of the first block
+        :param stop: height after the last block
+        :param concurrency: max blocks requests at once
+        :param prefetch: max blocks fetched (or being fetched) but not consumed yet
+        :param hashes_batch_size: heights resolved to hashes with one request
+        :param include_offsets: set `offset_in_block` for every transaction
+        :return: async generator of (height, `tools.block.Block`) tuples
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        pending = deque()
+
+        async def fetch(block_hash):
+            async with semaphore:
+                return await self.get_block_obj(block_hash, include_offsets=include_offsets)
+
+        def resolve(batch_start):
+            heights = range(batch_start, min(batch_start + hashes_batch_size, stop))
+            return heights, asyncio.ensure_future(self.get_block_hashes(heights))
+
+        next_hashes = resolve(start) if start < stop else None
+
+        try:
+            while next_hashes is not None:
+                heights, hashes = next_hashes
+                hashes = await hashes
+                # Resolve next heights while blocks of the current ones are fetched.
+                next_hashes = resolve(heights.stop) if heights.stop < stop else None
+
+                for height, block_hash in zip(heights, hashes):
+                    pending.append((height, asyncio.ensure_future(fetch(block_hash))))
+
+                    while len(pending) >= max(prefetch, 1):
+                        height_, block = pending.popleft()
+                        yield height_, await block
+
+            while pending:
+                height_, block = pending.popleft()
+                yield height_, await block
+        finally:
+            for _, block in pending:
+                block.cancel()
+
+            if next_hashes is not None:
+                next_hashes[1].cancel()
+
+    async def get_block_headers_raw(self, block_hashes) -> list:
+        """
+        Requests serialized headers (`getblockheader` with verbose=false) with one batch request.
+        :param block_hashes: iterable of blocks hashes
+        :return: list of 80-byte serialized headers
+        """
+        responses = await self.call_batch([('getblockheader', (block_hash, False)) for block_hash in block_hashes])
+
+        for response in responses:
+            if response['error']:
+                raise error_from_rpc(response['error'])
+
+        return [h2b(response['result']) for response in responses]
+
+    async def _find_fork_height(self, store, tip, batch_size):
+        # Height of the last header in the store which is in the node's best chain.
+        # The node can be behind the store (reorg to a shorter chain, another node).
+        height = min(store.height, tip)
+
+        while height >= 0:
+            heights = range(max(height - batch_size + 1, 0), height + 1)
+            hashes = await self.get_block_hashes(heights)
+
+            for h, block_hash in zip(reversed(heights), reversed(hashes)):
+                if block_hash == b2h_rev(store.hash_for_height(h)):
+                    return h
+
+            height = heights.start - 1
+
+        return -1
+
+    async def sync_headers(self, store, batch_size: int = 2000) -> int:
+        """
+        Catches up `tools.headerstore.HeaderStore` with the node's best chain.
+        Headers which are not in the best chain any more (reorg) are dropped first.
+        :param store: HeaderStore object
+        :param batch_size: headers requested with one batch request
+        :return: height of the store tip
+        """
+        tip = await self.get_block_count()
+
+        # Check the last few headers first, reorgs are short.
+        fork_height = await self._find_fork_height(store, tip, batch_size=10)
+        if fork_height < store.height:
+            store.truncate(fork_height + 1)
+
+        for start in range(store.height + 1, tip + 1, batch_size):
+            hashes = await self.get_block_hashes(range(start, min(start + batch_size, tip + 1)))
+            store.extend(await self.get_block_headers_raw(hashes))
+
+        return store.height
@@ -1,5 +1,6 @@
 # -*- coding: utf-8 -*-
 from .grambitcoin import GramBitcoin
+from .grampool import GramBitcoinPool
 
 
 class GramBitcoinCommon(GramBitcoin):
@@ -8,3 +9,21 @@ class GramBitcoinCommon(GramBitcoin):
         self.url = self.check_url(url, gram)
         self._gram = gram
         self.session = self.check_gram(gram)
+
+        if gram:
+            self.max_batch_size = gram.max_batch_size
+            self._coalescer = gram._coalescer
+            self._cache = gram._cache
+
+    async def _send(self, data):
+        # Pool chooses the node for every request itself.
+        if isinstance(self._gram, GramBitcoinPool):
+            return await self._gram._send(data)
+
+        return await super()._send(data)
+
+    async def _post(self, data, raw=False):
+        if isinstance(self._gram, GramBitcoinPool):
+            return await self._gram._post(data, raw=raw)
+
+        return await super()._post(data, raw=raw)
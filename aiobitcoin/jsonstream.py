@@ -0,0 +1,116 @@
+# -*- coding: utf-8 -*-
+import json
+import re
+
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# orjson is several times faster than json, but it's optional.
+loads = orjson.loads if orjson is not None else json.loads
+
+
+class JSONArrayStream:
+    """
+    Incrementally extracts items of `result[key]` array from chunks of JSON-RPC
+    response body, so the whole response is never decoded (or kept) at once.
+    Only the item being received is kept in the buffer.
+
+    :param str key:         Key of array in `result` object, e.g. `tx` for `getblock`
+    """
+
+    _TOKEN = re.compile(rb'["{}\[\],]')
+    _STRING_TAIL = re.compile(rb'(?:[^"\\]|\\.)*"', re.S)
+
+    def __init__(self, key):
+        self._key = json.dumps(key).encode()
+        self._buf = bytearray()
+        self._pos = 0
+        self._depth = 0
+        self._last_string = None
+        self._item_start = None
+        self.found = False
+        self.finished = False
+
+    def feed(self, chunk) -> list:
+        """
+        Pass next chunk of the body.
+        :param chunk: bytes
+        :return: list of items completed by this chunk
+        """
+        if self.finished:
+            return []
+
+        buf = self._buf
+        buf += chunk
+        items = []
+
+        while not self.finished:
+            match = self._TOKEN.search(buf, self._pos)
+            if match is None:
+                self._pos = len(buf)
+                break
+
+            i = match.start()
+            c = buf[i]
+
+            if c == 0x22:  # "
+                tail = self._STRING_TAIL.match(buf, i + 1)
+                if tail is None:
+                    # String is not received completely yet.
+                    self._pos = i
+                    break
+
+                if self._depth == 2 and not self.found:
+                    self._last_string = (i, tail.end())
+
+                self._pos = tail.end()
+                continue
+
+            self._pos = i + 1
+
+            if c in b'{[':
+                if c == 0x5b and self._depth == 2 and not self.found and self._is_key_before(i):
+                    self.found = True
+                    self._item_start = i + 1
+
+                self._depth += 1
+            elif c in b'}]':
+                if self.found and self._depth == 3:
+                    self._append_item(items, i)
+                    self.finished = True
+
+                self._depth -= 1
+            elif self.found and self._depth == 3:  # comma between items
+                self._append_item(items, i)
+                self._item_start = i + 1
+
+        if self.found:
+            # Drop the items already passed to the caller.
+            cut = len(buf) if self.finished else self._item_start
+            del buf[:cut]
+            self._pos -= cut
+            self._item_start = 0
+
+        return items
+
+    def _is_key_before(self, i):
+        if self._last_string is None:
+            return False
+
+        start, end = self._last_string
+        return self._buf[start:end] == self._key and self._buf[end:i].strip() == b':'
+
+    def _append_item(self, items, end):
+        item = bytes(self._buf[self._item_start:end]).strip()
+
+        if item:
+            items.append(loads(item))
+
+    def body(self):
+        """
+        :return: decoded response if array was not found (e.g. response with error)
+        """
+        return loads(bytes(self._buf))
@@ -0,0 +1,112 @@
+"""
+Read blocks directly from Bitcoin Core `blocks/blk*.dat` files.
+
+Every block in the file is framed as 4 bytes of network magic, 4 bytes of
+little-endian block size and the serialized block. Files are memory-mapped,
+so blocks are parsed straight from slices of the mapping without reading
+the whole file. Files must not be obfuscated (Bitcoin Core 28+ with -blocksxor=0).
+"""
+
+import glob
+import mmap
+import os
+import struct
+
+from concurrent.futures import ProcessPoolExecutor
+
+from .block import Block
+
+
+MAINNET_MAGIC = b'\xf9\xbe\xb4\xd9'
+TESTNET_MAGIC = b'\x0b\x11\x09\x07'
+REGTEST_MAGIC = b'\xfa\xbf\xb5\xda'
+
+NO_BLOCK = b'\0\0\0\0'
+BLOCK_SIZE_STRUCT = struct.Struct("<L")
+
+
+def blk_file_paths(blocks_dir):
+    """Return paths of blk*.dat files in blocks_dir in order."""
+    return sorted(glob.glob(os.path.join(blocks_dir, "blk[0-9]*.dat")))
+
+
+def iter_blocks_bin(path, magic=MAINNET_MAGIC):
+    """
+    Yield (offset, memoryview) for every block in the file, where offset is the
+    position of the serialized block in the file. The memoryview is released
+    when the next block is yielded, so parse (or copy) it before that. Slices
+    of it kept by the caller stay valid, the file then stays mapped until they
+    are garbage collected.
+    """
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return
+
+        mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+    try:
+        size = len(mm)
+        pos = 0
+
+        while pos + 8 <= size:
+            if mm[pos:pos + 4] != magic:
+                # The rest of the file is preallocated but not written yet.
+                if mm[pos:pos + 4] == NO_BLOCK:
+                    break
+
+                pos = mm.find(magic, pos + 1)
+                if pos < 0:
+                    break
+
+                continue
+
+            block_size, = BLOCK_SIZE_STRUCT.unpack_from(mm, pos + 4)
+            start = pos + 8
+            end = start + block_size
+
+            if end > size:
+                # Block was written partially.
+                break
+
+            with memoryview(mm)[start:end] as view:
+                yield start, view
+
+            pos = end
+    finally:
+        try:
+            mm.close()
+        except BufferError:
+            # The caller still holds slices of a block, the mapping is closed
+            # when the last of them is garbage collected.
+            pass
+
+
+def iter_blocks(path, magic=MAINNET_MAGIC, include_transactions=True, include_offsets=None, block_class=Block):
+    """
+    Yield (offset, Block) for every block in the file. Pass block_class=LazyBlock
+    to decode transactions inputs and outputs only when they are accessed.
+    """
+    for offset, view in iter_blocks_bin(path, magic=magic):
+        yield offset, block_class.parse_from_buffer(
+            view, include_transactions=include_transactions, include_offsets=include_offsets)
+
+
+def _map_blk_file(args):
+    path, f, magic, include_transactions, include_offsets, block_class = args
+    blocks = iter_blocks(
+        path, magic=magic, include_transactions=include_transactions, include_offsets=include_offsets,
+        block_class=block_class)
+
+    return [f(block) for _, block in blocks]
+
+
+def map_blk_files(f, paths, magic=MAINNET_MAGIC, include_transactions=True, include_offsets=None, block_class=Block,
+                  processes=None):
+    """
+    Parse every file in its own process and return, for every file, the list
+    of f(block) for its blocks. f must be picklable (a module level function).
+    """
+    args = [(path, f, magic, include_transactions, include_offsets, block_class) for path in paths]
+
+    with ProcessPoolExecutor(max_workers=processes) as executor:
+        return list(executor.map(_map_blk_file, args))
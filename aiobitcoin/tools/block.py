@@ -1,12 +1,17 @@
 
 import io
+import struct
 
 from .encoding import double_sha256
 from .merkle import merkle
-from .serialize.bitcoin_streamer import parse_struct, stream_struct
-from .serialize import b2h, b2h_rev
+from .serialize.bitcoin_streamer import parse_struct, stream_struct, parse_bc_int_from_buffer
+from .serialize import b2h, b2h_rev, bytes_as_revhex
 
-from .tx.Tx import Tx
+from .tx.Tx import Tx, bad_signatures
+from .tx.LazyTx import LazyTx
+
+
+HEADER_STRUCT = struct.Struct("<L32s32sLLL")
 
 
 class BadMerkleRootError(Exception):
@@ -14,10 +19,14 @@ class BadMerkleRootError(Exception):
 
 
 def difficulty_max_mask_for_bits(bits):
+    """Return the proof-of-work target encoded in compact `bits` form."""
     prefix = bits >> 24
-    mask = (bits & 0x7ffff) << (8 * (prefix - 3))
+    mantissa = bits & 0x7fffff
+
+    if prefix <= 3:
+        return mantissa >> (8 * (3 - prefix))
 
-    return mask
+    return mantissa << (8 * (prefix - 3))
 
 
 class Block(object):
@@ -50,9 +59,37 @@ class Block(object):
         return cls(version, previous_block_hash, merkle_root, timestamp, difficulty, nonce)
 
     @classmethod
-    def from_bin(cls, bytes):
-        f = io.BytesIO(bytes)
-        return cls.parse(f)
+    def parse_from_buffer(cls, data, offset=0, include_transactions=True, include_offsets=None):
+        """
+        Parse the Block from bytes or memoryview at offset without going through
+        a file-like object. Offsets of transactions are relative to the block start.
+        """
+        start = offset
+        (version, previous_block_hash, merkle_root, timestamp,
+            difficulty, nonce) = HEADER_STRUCT.unpack_from(data, offset)
+        block = cls(version, bytes_as_revhex(previous_block_hash), bytes_as_revhex(merkle_root),
+                    timestamp, difficulty, nonce)
+
+        if include_transactions:
+            count, offset = parse_bc_int_from_buffer(data, offset + HEADER_STRUCT.size)
+            parse_tx = cls.Tx.parse_from_buffer
+            txs = []
+
+            for i in range(count):
+                tx_offset = offset
+                tx, offset = parse_tx(data, offset)
+                txs.append(tx)
+
+                if include_offsets:
+                    tx.offset_in_block = tx_offset - start
+
+            block.set_txs(txs)
+
+        return block
+
+    @classmethod
+    def from_bin(cls, bytes, include_offsets=None):
+        return cls.parse_from_buffer(bytes, include_offsets=include_offsets)
 
     def __init__(self, version, previous_block_hash, merkle_root, timestamp, difficulty, nonce):
         self.version = version
@@ -156,9 +193,22 @@ class Block(object):
             raise BadMerkleRootError(
                 "calculated %s but block contains %s" % (b2h(calculated_hash), b2h(self.merkle_root)))
 
+    def verify_signatures(self, flags=None):
+        """
+        Return (tx, tx_in_idx) for every input which signatures are not ok, verifying
+        the signatures of the whole block together. Unspents of the transactions must be set.
+        """
+        return bad_signatures(self.txs, flags=flags)
+
     def __str__(self):
         c = '%s%s' % (self.__class__.__name__, '' if self.txs else 'Header')
         return "%s [%s] (previous %s)" % (c, self.id(), self.previous_block_id())
 
     def __repr__(self):
         return self.__str__()
+
+
+class LazyBlock(Block):
+    """A Block which parses its transactions as LazyTx (see parse_from_buffer)."""
+
+    Tx = LazyTx
@@ -42,8 +42,11 @@ class Curve:
     """Elliptic curve y^2 = x^3 + a*x + b over Fp group."""
 
     def __init__(self, p: int, a: int, b: int, G: Point, n: int,
-                 h: int, t: int, weakness_check: bool = True) -> None:
+                 h: int, t: int, weakness_check: bool = True,
+                 endomorphism=None) -> None:
         # Parameters are checked according to SEC 1 v.2 3.1.1.2.1
+        # endomorphism (optional) is the ecdsa.ellipticcurve.Endomorphism
+        # used by mult to split scalars in half-length ones
 
         # 1) check that p is an odd prime
         if p % 2 == 0:
@@ -119,6 +122,7 @@ class Curve:
 
         assert t == 0 or h <= pow(2, t / 8), f"h ({h}) too big for t ({t})"
         self.h = h
+        self.endomorphism = endomorphism
 
         # 7. Check that nG = Inf.
         # it cannot be simply checked with:
@@ -180,9 +184,11 @@ class Curve:
         if Q[2] == 0:  # Infinity point in Jacobian coordinates
             return Point()
         else:
-            Z2 = Q[2] * Q[2]
-            x = (Q[0] * mod_inv(Z2, self._p)) % self._p
-            y = (Q[1] * mod_inv(Z2 * Q[2], self._p)) % self._p
+            # one mod_inv: 1/Z^2 and 1/Z^3 are derived from 1/Z
+            Zinv = mod_inv(Q[2], self._p)
+            Zinv2 = Zinv * Zinv % self._p
+            x = (Q[0] * Zinv2) % self._p
+            y = (Q[1] * Zinv2 * Zinv) % self._p
 
             return Point(x, y)
 
@@ -196,8 +202,8 @@ class Curve:
 
         self.require_on_curve(Q1)
         self.require_on_curve(Q2)
-        # no Jacobian coordinates here as _aff_from_jac would cost 2 mod_inv
-        # while _add_aff costs only one mod_inv
+        # no Jacobian coordinates here as _aff_from_jac would cost a mod_inv
+        # on top of the Jacobian addition, while _add_aff costs only one mod_inv
         return self._add_aff(Q1, Q2)
 
     def _add_jac(self, Q: _JacPoint, R: _JacPoint) -> _JacPoint:
@@ -341,6 +347,9 @@ def _mult_jac(ec: Curve, m: int, Q: _JacPoint) -> _JacPoint:
     if m == 0 or Q[2] == 0:        # Infinity point in affine coordinates
         return 1, 1, 0             # return Infinity point
 
+    if ec.endomorphism is not None:
+        return _mult_jac_endomorphism(ec, m, Q)
+
     R = 1, 1, 0                    # initialize as infinity point
     while m > 0:                   # use binary representation of m
         if m & 1:                  # if least significant bit is 1
@@ -351,6 +360,36 @@ def _mult_jac(ec: Curve, m: int, Q: _JacPoint) -> _JacPoint:
     return R
 
 
+def _mult_jac_endomorphism(ec: Curve, m: int, Q: _JacPoint) -> _JacPoint:
+    # m*Q = m1*Q + m2*endomorphism(Q), with m1 and m2 about half as long as m:
+    # both are computed together (Shamir's trick), sharing the doublings
+    # Point is assumed to be on curve and not Infinity
+
+    m1, m2 = ec.endomorphism.split(m)
+    Q1 = Q
+    Q2 = ec.endomorphism.beta * Q[0] % ec._p, Q[1], Q[2]
+
+    # negative multipliers are accounted for with opposite points
+    if m1 < 0:
+        m1, Q1 = -m1, (Q1[0], ec._p - Q1[1], Q1[2])
+    if m2 < 0:
+        m2, Q2 = -m2, (Q2[0], ec._p - Q2[1], Q2[2])
+
+    Q12 = ec._add_jac(Q1, Q2)
+    R = 1, 1, 0                    # initialize as infinity point
+    for i in range(max(m1.bit_length(), m2.bit_length()) - 1, -1, -1):
+        R = ec._add_jac(R, R)
+        bits = (m1 >> i & 1, m2 >> i & 1)
+        if bits == (1, 1):
+            R = ec._add_jac(R, Q12)
+        elif bits == (1, 0):
+            R = ec._add_jac(R, Q1)
+        elif bits == (0, 1):
+            R = ec._add_jac(R, Q2)
+
+    return R
+
+
 def mult(ec: Curve, n: int, Q: Point = None) -> Point:
     # this function is used by the Curve class; it might be a method...
     # but it does not need to
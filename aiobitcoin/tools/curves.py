@@ -26,6 +26,7 @@
 # scroll down at the end of the file for 'relevant' code
 
 from .curve import Curve
+from .ecdsa.secp256k1 import endomorphism_secp256k1
 
 
 # bitcoin curve
@@ -36,4 +37,5 @@ __Gx = 0x79BE667EF9DCBBAC55A06295CE870B07029BFCDB2DCE28D959F2815B16F81798
 __Gy = 0x483ADA7726A3C4655DA4FBFC0E1108A8FD17B448A68554199C47D08FFB10D4B8
 __n = 0xFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFFEBAAEDCE6AF48A03BBFD25E8CD0364141
 __h = 1
-secp256k1 = Curve(__p, __a, __b, (__Gx, __Gy), __n, __h, 128, True)
+secp256k1 = Curve(__p, __a, __b, (__Gx, __Gy), __n, __h, 128, True,
+                  endomorphism_secp256k1)
@@ -1,6 +1,7 @@
 from .ecdsa import (  # noqa
-    deterministic_generate_k, is_public_pair_valid, public_pair_for_secret_exponent,
-    public_pair_for_x, possible_public_pairs_for_signature, sign, verify
+    deterministic_generate_k, is_public_pair_valid, native_backend, public_pair_for_secret_exponent,
+    public_pairs_for_secret_exponents, public_pair_for_x, possible_public_pairs_for_signature, sign, verify,
+    verify_many
 )
 
 from .ellipticcurve import CurveFp, Point, NoSuchPointError  # noqa
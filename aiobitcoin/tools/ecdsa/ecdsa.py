@@ -29,6 +29,26 @@ Portions written in 2005 by Peter Pearson and placed in the public domain.
 
 from . import ellipticcurve, numbertheory
 from .rfc6979 import deterministic_generate_k
+from .secp256k1 import generator_secp256k1
+
+try:
+    from .native.secp256k1 import LIBSECP256K1
+except ImportError:
+    LIBSECP256K1 = None
+
+
+def native_backend():
+    """
+    Return the library which does the secp256k1 math: 'secp256k1' (libsecp256k1),
+    'openssl' or 'python' if there is no native library (the slow mode).
+    """
+    if LIBSECP256K1:
+        return 'secp256k1'
+
+    if ellipticcurve.NATIVE_LIBRARY:
+        return 'openssl'
+
+    return 'python'
 
 
 def sign(generator, secret_exponent, val, gen_k=deterministic_generate_k):
@@ -45,6 +65,11 @@ def sign(generator, secret_exponent, val, gen_k=deterministic_generate_k):
     May raise RuntimeError, in which case retrying with a new
     random value k is in order.
     """
+    if LIBSECP256K1 and generator is generator_secp256k1 and gen_k is deterministic_generate_k:
+        signature = LIBSECP256K1.sign(secret_exponent, val)
+        if signature is not None:
+            return signature
+
     G = generator
     n = G.order()
     k = gen_k(n, secret_exponent, val)
@@ -64,9 +89,33 @@ def sign(generator, secret_exponent, val, gen_k=deterministic_generate_k):
 
 
 def public_pair_for_secret_exponent(generator, secret_exponent):
+    if LIBSECP256K1 and generator is generator_secp256k1:
+        public_pair = LIBSECP256K1.public_pair_for_secret_exponent(secret_exponent)
+        if public_pair is not None:
+            return public_pair
+
     return (generator*secret_exponent).pair()
 
 
+def public_pairs_for_secret_exponents(generator, secret_exponents):
+    """Return the list of public pairs for many secret exponents at once."""
+    if LIBSECP256K1 and generator is generator_secp256k1:
+        return [public_pair_for_secret_exponent(generator, e) for e in secret_exponents]
+
+    if ellipticcurve.NATIVE_LIBRARY:
+        n = generator.order()
+        pairs = ellipticcurve.NATIVE_LIBRARY.fast_mul_many(generator, [e % n for e in secret_exponents])
+        return [(None, None) if pair is None else pair for pair in pairs]
+
+    # Products are converted to affine coordinates with one inversion for all of them.
+    n = generator.order()
+    points = [generator._mul_jacobian(e % n) if e % n else ellipticcurve.JACOBIAN_INFINITY
+              for e in secret_exponents]
+    pairs = ellipticcurve.jacobian_to_affine_many(points, generator.curve().p())
+
+    return [(None, None) if pair is None else pair for pair in pairs]
+
+
 def public_pair_for_x(generator, x, is_even):
     curve = generator.curve()
     p = curve.p()
@@ -101,13 +150,88 @@ def verify(generator, public_pair, val, signature):
     if s < 1 or s > n-1:
         return False
 
+    if LIBSECP256K1 and generator is generator_secp256k1:
+        is_valid = LIBSECP256K1.verify(public_pair, val, signature)
+        if is_valid is not None:
+            return is_valid
+
     c = numbertheory.inverse_mod(s, n)
     u1 = (val * c) % n
     u2 = (r * c) % n
-    point = u1 * G + u2 * ellipticcurve.Point(G.curve(), public_pair[0], public_pair[1], G.order())
-    v = point.x() % n
 
-    return v == r
+    curve = G.curve()
+    p = curve.p()
+    # The constructor checks that the point is on the curve. Its order is not checked
+    # (that would be one more multiplication), as the curve has cofactor 1.
+    Q = ellipticcurve.Point(curve, public_pair[0], public_pair[1])
+
+    if ellipticcurve.NATIVE_LIBRARY:
+        point = u1 * G + u2 * Q
+        return point != ellipticcurve.INFINITY and point.x() % n == r
+
+    # u1 * G + u2 * Q in Jacobian coordinates, with shared doublings.
+    X, Y, Z = ellipticcurve.jacobian_mul_sum([(u1, G), (u2, Q)], p, curve.a())
+
+    return _is_x_mod_n(X, Y, Z, r, n, p)
+
+
+def _is_x_mod_n(X, Y, Z, r, n, p):
+    """Return True if the Jacobian point is not infinity and its affine x % n == r."""
+    if not Z:
+        return False
+
+    # Compare x without converting to affine: x = X / Z^2, and x % n == r means
+    # x is r or r + n (if it's less than p).
+    ZZ = Z * Z % p
+    for x in (r, r + n):
+        if x >= p:
+            break
+
+        if x * ZZ % p == X:
+            return True
+
+    return False
+
+
+def verify_many(generator, items):
+    """
+    Verify many signatures at once. items are (public_pair, val, signature) like
+    the arguments of verify. Return the list of results in the same order,
+    False for public pairs not on the curve (which verify raises for).
+    Inverses of all s values are computed with a single inversion.
+    """
+    items = list(items)
+
+    if LIBSECP256K1 or ellipticcurve.NATIVE_LIBRARY:
+        results = []
+        for public_pair, val, signature in items:
+            try:
+                results.append(verify(generator, public_pair, val, signature))
+            except ellipticcurve.NoSuchPointError:
+                results.append(False)
+
+        return results
+
+    G = generator
+    n = G.order()
+    curve = G.curve()
+    p = curve.p()
+
+    results = [False] * len(items)
+    valid = [i for i, (_, _, (r, s)) in enumerate(items) if 0 < r < n and 0 < s < n]
+    s_invs = numbertheory.inverse_mod_many([items[i][2][1] for i in valid], n)
+
+    for i, c in zip(valid, s_invs):
+        public_pair, val, (r, s) = items[i]
+        try:
+            Q = ellipticcurve.Point(curve, public_pair[0], public_pair[1])
+        except ellipticcurve.NoSuchPointError:
+            continue
+
+        X, Y, Z = ellipticcurve.jacobian_mul_sum([(val * c % n, G), (r * c % n, Q)], p, curve.a())
+        results[i] = _is_x_mod_n(X, Y, Z, r, n, p)
+
+    return results
 
 
 def possible_public_pairs_for_signature(generator, value, signature):
@@ -133,9 +257,16 @@ def possible_public_pairs_for_signature(generator, value, signature):
     for y in [beta, p - beta]:
         # 1.4 the constructor checks that nR is at infinity
         R = ellipticcurve.Point(curve, x, y, order)
-        # 1.6 compute Q = r^-1 (sR - eG)
-        Q = inv_r * (s * R + minus_e * G)
-        public_pair = (Q.x(), Q.y())
+        # 1.6 compute Q = r^-1 (sR - eG) = (r^-1 s) R + (r^-1 (-e)) G
+        if ellipticcurve.NATIVE_LIBRARY:
+            Q = inv_r * (s * R + minus_e * G)
+            public_pair = (Q.x(), Q.y())
+        else:
+            X, Y, Z = ellipticcurve.jacobian_mul_sum(
+                [(inv_r * s % order, R), (inv_r * minus_e % order, G)], p, curve.a())
+            if not Z:
+                continue
+            public_pair = ellipticcurve.jacobian_to_affine(X, Y, Z, p)
         # check that Q is the public key
 
         if verify(generator, public_pair, value, signature):
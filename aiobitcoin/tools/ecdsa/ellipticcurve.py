@@ -45,13 +45,218 @@ class NoSuchPointError(ValueError):
     pass
 
 
+# Points in Jacobian coordinates (X, Y, Z) stand for the affine (X/Z^2, Y/Z^3),
+# so adding and doubling them needs no modular inversion. Z == 0 is infinity.
+JACOBIAN_INFINITY = (1, 1, 0)
+
+
+def jacobian_double(X1, Y1, Z1, p, a):
+    if not Y1 or not Z1:
+        return JACOBIAN_INFINITY
+
+    YY = Y1 * Y1 % p
+    S = 4 * X1 * YY % p
+    M = 3 * X1 * X1
+
+    if a:
+        ZZ = Z1 * Z1 % p
+        M += a * ZZ * ZZ
+
+    M %= p
+    X3 = (M * M - 2 * S) % p
+    Y3 = (M * (S - X3) - 8 * YY * YY) % p
+    Z3 = 2 * Y1 * Z1 % p
+
+    return X3, Y3, Z3
+
+
+def jacobian_add_affine(X1, Y1, Z1, x2, y2, p, a):
+    """Add the affine point (x2, y2) (not infinity) to the Jacobian one."""
+    if not Z1:
+        return x2, y2, 1
+
+    ZZ = Z1 * Z1 % p
+    H = (x2 * ZZ - X1) % p
+    r = (y2 * ZZ * Z1 - Y1) % p
+
+    if not H:
+        if not r:
+            return jacobian_double(X1, Y1, Z1, p, a)
+
+        return JACOBIAN_INFINITY
+
+    HH = H * H % p
+    HHH = H * HH % p
+    V = X1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    Y3 = (r * (V - X3) - Y1 * HHH) % p
+    Z3 = Z1 * H % p
+
+    return X3, Y3, Z3
+
+
+def jacobian_add(X1, Y1, Z1, X2, Y2, Z2, p, a):
+    if not Z1:
+        return X2, Y2, Z2
+
+    if not Z2:
+        return X1, Y1, Z1
+
+    Z1Z1 = Z1 * Z1 % p
+    Z2Z2 = Z2 * Z2 % p
+    U1 = X1 * Z2Z2 % p
+    S1 = Y1 * Z2Z2 * Z2 % p
+    H = (X2 * Z1Z1 - U1) % p
+    r = (Y2 * Z1Z1 * Z1 - S1) % p
+
+    if not H:
+        if not r:
+            return jacobian_double(X1, Y1, Z1, p, a)
+
+        return JACOBIAN_INFINITY
+
+    HH = H * H % p
+    HHH = H * HH % p
+    V = U1 * HH % p
+    X3 = (r * r - HHH - 2 * V) % p
+    Y3 = (r * (V - X3) - S1 * HHH) % p
+    Z3 = Z1 * Z2 * H % p
+
+    return X3, Y3, Z3
+
+
+def wnaf(e, width):
+    """
+    Return the digits of e (negative e too) in width-w non-adjacent form, least significant
+    first. Non-zero digits are odd, below 2^(width-1) by absolute value, and are
+    followed by at least width-1 zeros.
+    """
+    digits = []
+    window = 1 << width
+    half = window >> 1
+
+    while e:
+        d = 0
+        if e & 1:
+            d = e & (window - 1)
+            if d >= half:
+                d -= window
+            e -= d
+
+        digits.append(d)
+        e >>= 1
+
+    return digits
+
+
+def jacobian_mul_sum(terms, p, a):
+    """
+    Return the sum of e * point for (e, point) in terms, in Jacobian coordinates.
+    All the products are computed together (Straus' interleaving), so they share
+    doublings, and with wNAF digits there are few additions for every scalar.
+    """
+    expansions = []
+
+    for e, point in terms:
+        if not e:
+            continue
+
+        width, multiples = point._wnaf_table()
+        endomorphism = point.curve().endomorphism()
+
+        if endomorphism:
+            # e * P = k1 * P + k2 * endomorphism(P) with half length k1 and k2, so half the doublings.
+            k1, k2 = endomorphism.split(e)
+            expansions.append((wnaf(k1, width), multiples))
+            expansions.append((wnaf(k2, width), point._endomorphism_wnaf_table(multiples)))
+        else:
+            expansions.append((wnaf(e, width), multiples))
+
+    X, Y, Z = JACOBIAN_INFINITY
+
+    for i in range(max([len(digits) for digits, _ in expansions] or [0]) - 1, -1, -1):
+        X, Y, Z = jacobian_double(X, Y, Z, p, a)
+
+        for digits, multiples in expansions:
+            if i >= len(digits) or not digits[i]:
+                continue
+
+            d = digits[i]
+            mX, mY, mZ = multiples[abs(d) >> 1]
+            if d < 0:
+                mY = p - mY
+
+            if mZ == 1:
+                X, Y, Z = jacobian_add_affine(X, Y, Z, mX, mY, p, a)
+            else:
+                X, Y, Z = jacobian_add(X, Y, Z, mX, mY, mZ, p, a)
+
+    return X, Y, Z
+
+
+def jacobian_to_affine(X, Y, Z, p):
+    """Return (x, y) for the Jacobian point, with the single inversion. Z must not be 0."""
+    z_inv = numbertheory.inverse_mod(Z, p)
+    zz_inv = z_inv * z_inv % p
+
+    return X * zz_inv % p, Y * zz_inv * z_inv % p
+
+
+def jacobian_to_affine_many(points, p):
+    """Return (x, y) (None for infinity) for every Jacobian point, with a single inversion for all."""
+    points = list(points)
+    z_invs = iter(numbertheory.inverse_mod_many([Z for X, Y, Z in points if Z], p))
+    pairs = []
+
+    for X, Y, Z in points:
+        if not Z:
+            pairs.append(None)
+            continue
+
+        z_inv = next(z_invs)
+        zz_inv = z_inv * z_inv % p
+        pairs.append((X * zz_inv % p, Y * zz_inv * z_inv % p))
+
+    return pairs
+
+
+class Endomorphism(object):
+    """
+    GLV endomorphism (x, y) -> (beta * x, y) of a curve with a = 0, which is
+    multiplication by lambda for points of order n. Any scalar k splits into
+    k1 + k2 * lambda (mod n) with k1 and k2 about half as long as n, using the
+    short basis (a1, b1), (a2, b2) of the lattice of (x, y) with x + y * lambda = 0 (mod n).
+    """
+
+    def __init__(self, n, beta, lambda_, a1, b1, a2, b2):
+        self.n = n
+        self.beta = beta
+        self.lambda_ = lambda_
+        self.basis = (a1, b1, a2, b2)
+
+    def split(self, k):
+        """Return (k1, k2) with k = k1 + k2 * lambda (mod n). They can be negative."""
+        n = self.n
+        a1, b1, a2, b2 = self.basis
+        k %= n
+
+        c1 = (b2 * k + n // 2) // n
+        c2 = (-b1 * k + n // 2) // n
+
+        return k - c1 * a1 - c2 * a2, -c1 * b1 - c2 * b2
+
+
 class CurveFp(object):
     """Elliptic Curve over the field of integers modulo a prime."""
-    def __init__(self, p, a, b):
-        """The curve of points satisfying y^2 = x^3 + a*x + b (mod p)."""
+    def __init__(self, p, a, b, endomorphism=None):
+        """
+        The curve of points satisfying y^2 = x^3 + a*x + b (mod p). If the curve has
+        an Endomorphism, multiplications of points use it.
+        """
         self.__p = p
         self.__a = a
         self.__b = b
+        self.__endomorphism = endomorphism
 
     def p(self):
         return self.__p
@@ -62,6 +267,9 @@ class CurveFp(object):
     def b(self):
         return self.__b
 
+    def endomorphism(self):
+        return self.__endomorphism
+
     def contains_point(self, x, y):
         """Is the point (x,y) on this curve?"""
         return (y * y - (x * x * x + self.__a * x + self.__b)) % self.__p == 0
@@ -130,16 +338,6 @@ class Point(object):
 
     def __mul__(self, other):
         """Multiply a point by an integer."""
-
-        def leftmost_bit(x):
-            assert x > 0
-            result = 1
-
-            while result <= x:
-                result = 2 * result
-
-            return result // 2
-
         e = other
         if self.__order:
             e = e % self.__order
@@ -152,30 +350,45 @@ class Point(object):
 
         assert e > 0
 
-        # From X9.62 D.3.2:
-
         if NATIVE_LIBRARY:
-            return NATIVE_LIBRARY.fast_mul(self, other)
+            pair = NATIVE_LIBRARY.fast_mul(self, e)
+            return INFINITY if pair is None else Point(self.__curve, pair[0], pair[1])
 
-        e3 = 3 * e
-        negative_self = Point(self.__curve, self.__x, -self.__y, self.__order)
-        i = leftmost_bit(e3) // 2
-        result = self
+        X, Y, Z = self._mul_jacobian(e)
+        if not Z:
+            return INFINITY
 
-        # print "Multiplying %s by %d (e3 = %d):" % (self, other, e3)
-        while i > 1:
-            result = result.double()
+        x, y = jacobian_to_affine(X, Y, Z, self.__curve.p())
 
-            if (e3 & i) != 0 and (e & i) == 0:
-                result = result + self
+        return Point(self.__curve, x, y)
 
-            if (e3 & i) == 0 and (e & i) != 0:
-                result = result + negative_self
+    # Width of wNAF digits of scalars this point is multiplied by.
+    WNAF_WIDTH = 5
 
-            # print ". . . i = %d, result = %s" % (i, result)
-            i = i // 2
+    def _wnaf_table(self):
+        """Return (width, [P, 3P, 5P, ...]) in Jacobian coordinates for jacobian_mul_sum."""
+        p = self.__curve.p()
+        a = self.__curve.a()
+        P = (self.__x, self.__y, 1)
+        P2 = jacobian_double(*P, p=p, a=a)
+        multiples = [P]
+
+        for i in range((1 << (self.WNAF_WIDTH - 2)) - 1):
+            multiples.append(jacobian_add(*multiples[-1], *P2, p=p, a=a))
+
+        return self.WNAF_WIDTH, multiples
+
+    def _endomorphism_wnaf_table(self, multiples):
+        """Return the odd multiples from _wnaf_table mapped by the curve endomorphism."""
+        p = self.__curve.p()
+        beta = self.__curve.endomorphism().beta
 
-        return result
+        # beta * x = beta * X / Z^2, so only X changes.
+        return [(beta * X % p, Y, Z) for X, Y, Z in multiples]
+
+    def _mul_jacobian(self, e):
+        """Return e * self in Jacobian coordinates, e must be positive."""
+        return jacobian_mul_sum([(e, self)], self.__curve.p(), self.__curve.a())
 
     def __rmul__(self, other):
         """Multiply a point by an integer."""
@@ -226,6 +439,87 @@ class Point(object):
         return self.__order
 
 
+class FixedBasePoint(Point):
+    """
+    Point which is multiplied many times (a generator). On the first
+    multiplication a table of d * 2^(WINDOW * i) * self is built for every digit
+    d and window i of the scalar, so e * self is the sum of one table point per
+    window of e, without doublings. The point must have order.
+    """
+
+    WINDOW = 4
+    WNAF_WIDTH = 8
+
+    _table = None
+    _wnaf_multiples = None
+    _endomorphism_multiples = None
+
+    def _build_table(self):
+        curve = self.curve()
+        p = curve.p()
+        a = curve.a()
+        x, y = self.pair()
+        windows = (self.order().bit_length() + self.WINDOW - 1) // self.WINDOW
+
+        points = []
+        X, Y, Z = x, y, 1
+
+        for i in range(windows):
+            base = (X, Y, Z)
+
+            for d in range(1, 1 << self.WINDOW):
+                points.append((X, Y, Z))
+                X, Y, Z = jacobian_add(X, Y, Z, *base, p=p, a=a)
+
+        row_size = (1 << self.WINDOW) - 1
+        pairs = jacobian_to_affine_many(points, p)
+
+        return [pairs[i:i + row_size] for i in range(0, len(pairs), row_size)]
+
+    def _wnaf_table(self):
+        # Odd multiples are kept in affine coordinates, so they are added without inversions.
+        if self._wnaf_multiples is None:
+            p = self.curve().p()
+            width, multiples = super(FixedBasePoint, self)._wnaf_table()
+            self._wnaf_multiples = [pair + (1,) for pair in jacobian_to_affine_many(multiples, p)]
+
+        return self.WNAF_WIDTH, self._wnaf_multiples
+
+    def _endomorphism_wnaf_table(self, multiples):
+        if self._endomorphism_multiples is None:
+            self._endomorphism_multiples = super(FixedBasePoint, self)._endomorphism_wnaf_table(multiples)
+
+        return self._endomorphism_multiples
+
+    def _mul_jacobian(self, e):
+        table = self._table
+        if table is None:
+            table = self._table = self._build_table()
+
+        window = self.WINDOW
+
+        if e >> (window * len(table)):
+            return super(FixedBasePoint, self)._mul_jacobian(e)
+
+        curve = self.curve()
+        p = curve.p()
+        a = curve.a()
+        mask = (1 << window) - 1
+        X, Y, Z = JACOBIAN_INFINITY
+
+        for row in table:
+            d = e & mask
+            if d and row[d - 1] is not None:
+                x, y = row[d - 1]
+                X, Y, Z = jacobian_add_affine(X, Y, Z, x, y, p, a)
+
+            e >>= window
+            if not e:
+                break
+
+        return X, Y, Z
+
+
 # This one point is the Point At Infinity for all purposes:
 INFINITY = Point(None, None, None)
 
@@ -1,12 +1,7 @@
 import ctypes.util
 import os
 import platform
-
-from .bignum import bignum_type_for_library
-
-
-class BignumContext(ctypes.Structure):
-    pass
+import threading
 
 
 def set_api(library, api_info):
@@ -34,27 +29,28 @@ def load_library():
         return None
 
     library = ctypes.CDLL(library_path)
-    library.BignumType = bignum_type_for_library(library)
 
-    BN_P = ctypes.POINTER(library.BignumType)
-    BN_CTX = ctypes.POINTER(BignumContext)
+    # BIGNUM, BN_CTX, EC_GROUP and EC_POINT are opaque, only pointers are passed around.
+    BN_P = ctypes.c_void_p
+    BN_CTX = ctypes.c_void_p
 
     BIGNUM_API = [
-        ("BN_init", [BN_P], None),
         ("BN_new", [], BN_P),
-        ("BN_set_word", [BN_P, ctypes.c_ulong], ctypes.c_int),
         ("BN_clear_free", [BN_P], None),
         ("BN_bin2bn", [ctypes.c_char_p, ctypes.c_int, BN_P], BN_P),
+        ("BN_bn2bin", [BN_P, ctypes.c_char_p], ctypes.c_int),
+        ("BN_num_bits", [BN_P], ctypes.c_int),
         ("BN_mod_inverse", [BN_P, BN_P, BN_P, BN_CTX], BN_P),
         ("BN_CTX_new", [], BN_CTX),
         ("BN_CTX_free", [BN_CTX], None),
-        ("BN_mpi2bn", [ctypes.c_char_p, ctypes.c_int, BN_P], BN_P),
     ]
 
     ECC_API = [
         ("EC_GROUP_new_by_curve_name", [ctypes.c_int], ctypes.c_void_p),
-        ("EC_POINT_new", [ctypes.c_void_p], ctypes.c_void_p),  # : make this a EC_POINT type
+        ("EC_GROUP_get0_generator", [ctypes.c_void_p], ctypes.c_void_p),
+        ("EC_POINT_new", [ctypes.c_void_p], ctypes.c_void_p),
         ("EC_POINT_free", [ctypes.c_void_p], None),
+        ("EC_POINT_is_at_infinity", [ctypes.c_void_p, ctypes.c_void_p], ctypes.c_int),
         ("EC_POINT_set_affine_coordinates_GFp",
             [ctypes.c_void_p, ctypes.c_void_p, BN_P, BN_P, BN_CTX], ctypes.c_int),
         ("EC_POINT_get_affine_coordinates_GFp",
@@ -65,41 +61,134 @@ def load_library():
 
     set_api(library, BIGNUM_API)
     set_api(library, ECC_API)
+
+    try:
+        set_api(library, [("EC_GROUP_precompute_mult", [ctypes.c_void_p, BN_CTX], ctypes.c_int)])
+    except AttributeError:
+        pass
+
     return library
 
 
+class _Objects(object):
+    """
+    OpenSSL objects reused by every call in a thread: BN_CTX can't be shared
+    between threads, and allocating objects per call costs more than the math.
+    """
+
+    def __init__(self, library, group):
+        self._library = library
+        self.ctx = library.BN_CTX_new()
+        self.x = library.BN_new()
+        self.y = library.BN_new()
+        self.n = library.BN_new()
+        self.point = library.EC_POINT_new(group)
+        self.result = library.EC_POINT_new(group)
+        self.buffer = ctypes.create_string_buffer(32)
+
+    def set_int(self, bn, v):
+        the_bytes = v.to_bytes((v.bit_length() + 7) // 8, "big")
+        self._library.BN_bin2bn(the_bytes, len(the_bytes), bn)
+
+    def get_int(self, bn):
+        size = (self._library.BN_num_bits(bn) + 7) // 8
+        if size > len(self.buffer):
+            self.buffer = ctypes.create_string_buffer(size)
+
+        self._library.BN_bn2bin(bn, self.buffer)
+        return int.from_bytes(self.buffer.raw[:size], "big")
+
+    def __del__(self):
+        library = self._library
+        library.EC_POINT_free(self.point)
+        library.EC_POINT_free(self.result)
+
+        for bn in (self.x, self.y, self.n):
+            library.BN_clear_free(bn)
+
+        library.BN_CTX_free(self.ctx)
+
+
+def make_objects_f(library, group):
+    """Return a function which returns _Objects of the current thread, freed when the thread ends."""
+    local = threading.local()
+
+    def objects():
+        o = getattr(local, "objects", None)
+        if o is None:
+            o = local.objects = _Objects(library, group)
+
+        return o
+
+    return objects
+
+
 def make_fast_mul_f(library):
     NID_secp256k1_GROUP = library.EC_GROUP_new_by_curve_name(714)
+    objects = make_objects_f(library, NID_secp256k1_GROUP)
+    o = objects()
 
-    def fast_mul(point, N):
-        bn_x = library.BignumType(point.x())
-        bn_y = library.BignumType(point.y())
-        bn_n = library.BignumType(N)
+    # Keep the coordinates of the generator to use OpenSSL's generator multiplication for it.
+    library.EC_POINT_get_affine_coordinates_GFp(
+        NID_secp256k1_GROUP, library.EC_GROUP_get0_generator(NID_secp256k1_GROUP), o.x, o.y, o.ctx)
+    generator_pair = (o.get_int(o.x), o.get_int(o.y))
+
+    if hasattr(library, "EC_GROUP_precompute_mult"):
+        library.EC_GROUP_precompute_mult(NID_secp256k1_GROUP, o.ctx)
+
+    def fast_mul_many(point, scalars):
+        """
+        Return N * point as a public pair (None for infinity) for every N in scalars.
+        The point and OpenSSL objects are set up once for all the scalars.
+        """
+        o = objects()
+        group = NID_secp256k1_GROUP
+        ctx = o.ctx
+        pair = point.pair()
+        is_generator = (pair == generator_pair)
 
-        ctx = library.BN_CTX_new()
-        ec_result = library.EC_POINT_new(NID_secp256k1_GROUP)
-        ec_point = library.EC_POINT_new(NID_secp256k1_GROUP)
+        if not is_generator:
+            o.set_int(o.x, pair[0])
+            o.set_int(o.y, pair[1])
+            library.EC_POINT_set_affine_coordinates_GFp(group, o.point, o.x, o.y, ctx)
 
-        library.EC_POINT_set_affine_coordinates_GFp(NID_secp256k1_GROUP, ec_point, bn_x, bn_y, ctx)
+        pairs = []
 
-        library.EC_POINT_mul(NID_secp256k1_GROUP, ec_result, None, ec_point, bn_n, ctx)
+        for N in scalars:
+            o.set_int(o.n, N)
 
-        library.EC_POINT_get_affine_coordinates_GFp(NID_secp256k1_GROUP, ec_result, bn_x, bn_y, ctx)
-        library.EC_POINT_free(ec_point)
-        library.EC_POINT_free(ec_result)
-        library.BN_CTX_free(ctx)
-        return type(point)(point.curve(), bn_x.to_int(), bn_y.to_int())
+            if is_generator:
+                library.EC_POINT_mul(group, o.result, o.n, None, None, ctx)
+            else:
+                library.EC_POINT_mul(group, o.result, None, o.point, o.n, ctx)
 
-    return fast_mul
+            if library.EC_POINT_is_at_infinity(group, o.result):
+                pairs.append(None)
+                continue
+
+            library.EC_POINT_get_affine_coordinates_GFp(group, o.result, o.x, o.y, ctx)
+            pairs.append((o.get_int(o.x), o.get_int(o.y)))
+
+        return pairs
+
+    def fast_mul(point, N):
+        """Return N * point as a public pair, None if it is infinity."""
+        return fast_mul_many(point, (N,))[0]
+
+    return fast_mul, fast_mul_many
 
 
 def make_inverse_mod_f(library):
+    objects = make_objects_f(library, library.EC_GROUP_new_by_curve_name(714))
+
     def inverse_mod(a, n):
-        ctx = library.BN_CTX_new()
-        a1 = library.BignumType(a)
-        library.BN_mod_inverse(a1, a1, library.BignumType(n), ctx)
-        library.BN_CTX_free(ctx)
-        return a1.to_int()
+        o = objects()
+        o.set_int(o.x, a % n)
+        o.set_int(o.y, n)
+        result = library.BN_mod_inverse(o.x, o.x, o.y, o.ctx)
+        assert result
+
+        return o.get_int(o.x)
 
     return inverse_mod
 
@@ -110,5 +199,5 @@ except:
     NATIVE_LIBRARY = None
 
 if NATIVE_LIBRARY:
-    NATIVE_LIBRARY.fast_mul = make_fast_mul_f(NATIVE_LIBRARY)
+    NATIVE_LIBRARY.fast_mul, NATIVE_LIBRARY.fast_mul_many = make_fast_mul_f(NATIVE_LIBRARY)
     NATIVE_LIBRARY.inverse_mod = make_inverse_mod_f(NATIVE_LIBRARY)
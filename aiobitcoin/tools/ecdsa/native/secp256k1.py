@@ -0,0 +1,166 @@
+"""
+Arrange to access libsecp256k1 (the library used by Bitcoin Core) using Python ctypes.
+
+The library is found with ctypes.util.find_library or loaded from the path in
+the PYCOIN_LIBSECP256K1_PATH environment variable.
+"""
+
+import ctypes
+import ctypes.util
+import os
+
+from ..intstream import from_bytes, to_bytes
+
+
+SECP256K1_CONTEXT_VERIFY = (1 << 0) | (1 << 8)
+SECP256K1_CONTEXT_SIGN = (1 << 0) | (1 << 9)
+SECP256K1_EC_COMPRESSED = (1 << 1) | (1 << 8)
+SECP256K1_EC_UNCOMPRESSED = (1 << 1)
+
+# Sizes of the opaque secp256k1_pubkey and secp256k1_ecdsa_signature structures.
+PUBKEY_SIZE = 64
+SIGNATURE_SIZE = 64
+
+_ORDER = 0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141
+
+SECP256K1_API = [
+    ("secp256k1_context_create", [ctypes.c_uint], ctypes.c_void_p),
+    ("secp256k1_ec_pubkey_create", [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p], ctypes.c_int),
+    ("secp256k1_ec_pubkey_parse",
+        [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_size_t], ctypes.c_int),
+    ("secp256k1_ec_pubkey_serialize",
+        [ctypes.c_void_p, ctypes.c_char_p, ctypes.POINTER(ctypes.c_size_t), ctypes.c_char_p, ctypes.c_uint],
+        ctypes.c_int),
+    ("secp256k1_ec_pubkey_tweak_add", [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p], ctypes.c_int),
+    ("secp256k1_ecdsa_sign",
+        [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_void_p, ctypes.c_void_p],
+        ctypes.c_int),
+    ("secp256k1_ecdsa_verify",
+        [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p, ctypes.c_char_p], ctypes.c_int),
+    ("secp256k1_ecdsa_signature_parse_compact",
+        [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p], ctypes.c_int),
+    ("secp256k1_ecdsa_signature_serialize_compact",
+        [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p], ctypes.c_int),
+    ("secp256k1_ecdsa_signature_normalize",
+        [ctypes.c_void_p, ctypes.c_char_p, ctypes.c_char_p], ctypes.c_int),
+]
+
+
+class Secp256k1Library(object):
+    """
+    The subset of libsecp256k1 used by the ecdsa module, with python ints for
+    scalars and public pairs. Methods return None if the library rejects the
+    input (e.g. a point not on the curve), so the caller can fall back to the
+    pure python implementation and its errors.
+    """
+
+    def __init__(self, library):
+        self.library = library
+        self.ctx = library.secp256k1_context_create(SECP256K1_CONTEXT_SIGN | SECP256K1_CONTEXT_VERIFY)
+
+    def _parse_public_pair(self, public_pair):
+        pubkey = ctypes.create_string_buffer(PUBKEY_SIZE)
+        sec = b'\4' + to_bytes(public_pair[0], 32) + to_bytes(public_pair[1], 32)
+
+        if not self.library.secp256k1_ec_pubkey_parse(self.ctx, pubkey, sec, len(sec)):
+            return None
+
+        return pubkey
+
+    def _serialize(self, pubkey, compressed=False):
+        output = ctypes.create_string_buffer(65)
+        size = ctypes.c_size_t(65)
+        flags = SECP256K1_EC_COMPRESSED if compressed else SECP256K1_EC_UNCOMPRESSED
+        self.library.secp256k1_ec_pubkey_serialize(self.ctx, output, ctypes.byref(size), pubkey, flags)
+
+        return output.raw[:size.value]
+
+    def _public_pair(self, pubkey):
+        sec = self._serialize(pubkey)
+        return from_bytes(sec[1:33]), from_bytes(sec[33:])
+
+    def public_pair_for_secret_exponent(self, secret_exponent):
+        if not 0 < secret_exponent < _ORDER:
+            return None
+
+        pubkey = ctypes.create_string_buffer(PUBKEY_SIZE)
+        if not self.library.secp256k1_ec_pubkey_create(self.ctx, pubkey, to_bytes(secret_exponent, 32)):
+            return None
+
+        return self._public_pair(pubkey)
+
+    def public_pair_add_multiple(self, public_pair, e):
+        """Return public_pair + e * G, None if it is infinity or e is not in [0, n-1]."""
+        pubkey = self._parse_public_pair(public_pair)
+        if pubkey is None or not 0 <= e < _ORDER:
+            return None
+
+        if not self.library.secp256k1_ec_pubkey_tweak_add(self.ctx, pubkey, to_bytes(e, 32)):
+            return None
+
+        return self._public_pair(pubkey)
+
+    def sec_to_public_pair(self, sec):
+        pubkey = ctypes.create_string_buffer(PUBKEY_SIZE)
+        if not self.library.secp256k1_ec_pubkey_parse(self.ctx, pubkey, sec, len(sec)):
+            return None
+
+        return self._public_pair(pubkey)
+
+    def sign(self, secret_exponent, val):
+        """
+        Sign with the RFC6979 nonce, as ecdsa.sign does by default. The signature
+        has low s (n - s of the pure python one, if that s is high).
+        """
+        if not 0 < secret_exponent < _ORDER or not 0 <= val < (1 << 256):
+            return None
+
+        signature = ctypes.create_string_buffer(SIGNATURE_SIZE)
+        if not self.library.secp256k1_ecdsa_sign(
+                self.ctx, signature, to_bytes(val, 32), to_bytes(secret_exponent, 32), None, None):
+            return None
+
+        compact = ctypes.create_string_buffer(64)
+        self.library.secp256k1_ecdsa_signature_serialize_compact(self.ctx, compact, signature)
+
+        return from_bytes(compact.raw[:32]), from_bytes(compact.raw[32:])
+
+    def verify(self, public_pair, val, signature):
+        pubkey = self._parse_public_pair(public_pair)
+        if pubkey is None:
+            return None
+
+        r, s = signature
+        parsed = ctypes.create_string_buffer(SIGNATURE_SIZE)
+        if not self.library.secp256k1_ecdsa_signature_parse_compact(
+                self.ctx, parsed, to_bytes(r, 32) + to_bytes(s, 32)):
+            return False
+
+        # libsecp256k1 accepts low s only, but either s is valid for ECDSA.
+        self.library.secp256k1_ecdsa_signature_normalize(self.ctx, parsed, parsed)
+
+        return bool(self.library.secp256k1_ecdsa_verify(self.ctx, parsed, to_bytes(val % _ORDER, 32), pubkey))
+
+
+def load_library():
+    if os.getenv("PYCOIN_NATIVE", "secp256k1") != "secp256k1":
+        return None
+
+    library_path = os.getenv("PYCOIN_LIBSECP256K1_PATH") or ctypes.util.find_library('secp256k1')
+    if library_path is None:
+        return None
+
+    library = ctypes.CDLL(library_path)
+
+    for f_name, argtypes, restype in SECP256K1_API:
+        f = getattr(library, f_name)
+        f.argtypes = argtypes
+        f.restype = restype
+
+    return Secp256k1Library(library)
+
+
+try:
+    LIBSECP256K1 = load_library()
+except Exception:
+    LIBSECP256K1 = None
@@ -30,10 +30,56 @@ def inverse_mod(a, m):
         return ud + m
 
 
+def _inverse_mod_pow(a, m):
+    """Inverse of a mod m."""
+    try:
+        return pow(a, -1, m)
+    except ValueError:
+        # Raise what inverse_mod always raised for a not invertible.
+        raise AssertionError("%d is not invertible mod %d" % (a, m))
+
+
+try:
+    # Python 3.8+ computes modular inverses in C.
+    pow(2, -1, 3)
+    inverse_mod = _inverse_mod_pow
+except ValueError:
+    pass
+
+
 if NATIVE_LIBRARY:
     inverse_mod = NATIVE_LIBRARY.inverse_mod
 
 
+def inverse_mod_many(values, m):
+    """
+    Return the list of inverses of values mod m, using one inverse_mod and
+    three multiplications per value (Montgomery's trick). All values must
+    be invertible.
+    """
+    values = list(values)
+    products = []
+    product = 1
+
+    for v in values:
+        product = product * v % m
+        products.append(product)
+
+    if not products:
+        return []
+
+    inverse = inverse_mod(product, m)
+    inverses = [0] * len(products)
+
+    for i in range(len(products) - 1, 0, -1):
+        inverses[i] = inverse * products[i - 1] % m
+        inverse = inverse * values[i] % m
+
+    inverses[0] = inverse
+
+    return inverses
+
+
 # from http://eli.thegreenplace.net/2009/03/07/computing-modular-square-roots-in-python/
 # with few fixes and suggestions from
 # http://codereview.stackexchange.com/questions/43210/tonelli-shanks-algorithm-implementation-of-prime-modular-square-root
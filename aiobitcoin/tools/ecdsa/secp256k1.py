@@ -1,4 +1,4 @@
-from .ellipticcurve import CurveFp, Point
+from .ellipticcurve import CurveFp, Endomorphism, FixedBasePoint
 
 # Certicom secp256-k1
 _a = 0x0000000000000000000000000000000000000000000000000000000000000000
@@ -8,4 +8,16 @@ _Gx = 0x79be667ef9dcbbac55a06295ce870b07029bfcdb2dce28d959f2815b16f81798
 _Gy = 0x483ada7726a3c4655da4fbfc0e1108a8fd17b448a68554199c47d08ffb10d4b8
 _r = 0xfffffffffffffffffffffffffffffffebaaedce6af48a03bbfd25e8cd0364141
 
-generator_secp256k1 = Point(CurveFp(_p, _a, _b), _Gx, _Gy, _r)
\ No newline at end of file
+# (x, y) -> (beta * x, y) is multiplication by lambda, and the lattice basis
+# is the one used by libsecp256k1 to split scalars.
+_beta = 0x7ae96a2b657c07106e64479eac3434e99cf0497512f58995c1396c28719501ee
+_lambda = 0x5363ad4cc05c30e0a5261c028812645a122e22ea20816678df02967c1b23bd72
+_a1 = 0x3086d221a7d46bcde86c90e49284eb15
+_b1 = -0xe4437ed6010e88286f547fa90abfe4c3
+_a2 = 0x114ca50f7a8e2f3f657c1108d9d44cfd8
+_b2 = 0x3086d221a7d46bcde86c90e49284eb15
+
+endomorphism_secp256k1 = Endomorphism(_r, _beta, _lambda, _a1, _b1, _a2, _b2)
+
+# Multiples of the generator are taken from a table built on the first use.
+generator_secp256k1 = FixedBasePoint(CurveFp(_p, _a, _b, endomorphism_secp256k1), _Gx, _Gy, _r)
@@ -257,6 +257,13 @@ def sec_to_public_pair(sec, strict=True):
     elif len(sec) == 33:
         if not strict or (sec0 in (b'\2', b'\3')):
             from .ecdsa import public_pair_for_x, generator_secp256k1
+            from .ecdsa.ecdsa import LIBSECP256K1
+
+            if LIBSECP256K1 and sec0 in (b'\2', b'\3'):
+                public_pair = LIBSECP256K1.sec_to_public_pair(sec)
+                if public_pair is not None:
+                    return public_pair
+
             return public_pair_for_x(generator_secp256k1, x, is_even=(sec0 == b'\2'))
 
     raise EncodingError("bad sec encoding for public key")
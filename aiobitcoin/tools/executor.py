@@ -0,0 +1,64 @@
+"""
+Run CPU-bound work (signing, key derivation) from coroutines without blocking
+the event loop, so signing bursts don't stall RPC calls in flight.
+"""
+
+import asyncio
+import functools
+
+from concurrent.futures import ProcessPoolExecutor
+
+
+class CryptoExecutor(object):
+    """
+    Runs functions in an executor, at most `concurrency` of them at once.
+
+    :param executor: `concurrent.futures.Executor` for the work, None for the default
+        thread pool of the event loop. A `ProcessPoolExecutor` is given only picklable
+        work (e.g. signatures of `Tx.sign_async`), the rest runs in the default thread pool.
+    :param int concurrency (4): max calls running at once
+    """
+
+    def __init__(self, executor=None, concurrency=4):
+        self.executor = executor
+        self.concurrency = concurrency
+        self._semaphore = None
+        self._loop = None
+
+    def is_process_pool(self):
+        return isinstance(self.executor, ProcessPoolExecutor)
+
+    def _get_semaphore(self, loop):
+        # Semaphores belong to a loop.
+        if self._semaphore is None or self._loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.concurrency)
+            self._loop = loop
+
+        return self._semaphore
+
+    async def _run(self, executor, f, args, kwargs):
+        loop = asyncio.get_event_loop()
+
+        async with self._get_semaphore(loop):
+            return await loop.run_in_executor(executor, functools.partial(f, *args, **kwargs))
+
+    async def run(self, f, *args, **kwargs):
+        """Return f(*args, **kwargs) computed in the executor. f and arguments must be picklable for processes."""
+        return await self._run(self.executor, f, args, kwargs)
+
+    async def run_in_thread(self, f, *args, **kwargs):
+        """Return f(*args, **kwargs) computed in the executor, or in a thread if it's a process pool."""
+        executor = None if self.is_process_pool() else self.executor
+        return await self._run(executor, f, args, kwargs)
+
+
+DEFAULT_CRYPTO_EXECUTOR = CryptoExecutor()
+
+
+def set_default_crypto_executor(crypto_executor):
+    global DEFAULT_CRYPTO_EXECUTOR
+    DEFAULT_CRYPTO_EXECUTOR = crypto_executor
+
+
+def get_default_crypto_executor():
+    return DEFAULT_CRYPTO_EXECUTOR
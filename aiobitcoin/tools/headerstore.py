@@ -0,0 +1,145 @@
+"""
+Store of block headers in a file of fixed-width 80-byte records, so headers
+can be looked up by height (record offset is height * 80) or by hash (index
+built when the file is opened) without calling the node.
+"""
+
+import io
+import os
+
+from .block import Block, difficulty_max_mask_for_bits
+from .encoding import double_sha256, from_bytes_32
+from .serialize import b2h_rev, h2b_rev
+
+
+HEADER_SIZE = 80
+
+
+class BadHeaderError(Exception):
+    pass
+
+
+def check_header_pow(header_hash, bits):
+    """Raise a BadHeaderError if the header hash is above the target from bits."""
+    if from_bytes_32(header_hash[::-1]) > difficulty_max_mask_for_bits(bits):
+        raise BadHeaderError("header %s does not match its proof-of-work target" % b2h_rev(header_hash))
+
+
+class HeaderStore(object):
+    """
+    Headers chain starting from the genesis block, kept in the file at path.
+
+    Every appended header is checked to link to the previous one and to satisfy
+    the proof-of-work target from its own bits (unless verify is False).
+    Hashes are the same as Block.hash() returns (internal byte order), the
+    lookup methods also accept them as hex strings in the displayed order.
+    """
+
+    def __init__(self, path, verify=True):
+        self.path = path
+        self.verify = verify
+        self._height_for_hash = {}
+        self._tip_hash = None
+
+        mode = "r+b" if os.path.exists(path) else "w+b"
+        self._f = open(path, mode)
+        self._load()
+
+    def _load(self):
+        size = self._f.seek(0, io.SEEK_END)
+        # Drop a partially written record left by an interrupted write.
+        if size % HEADER_SIZE:
+            size -= size % HEADER_SIZE
+            self._f.truncate(size)
+
+        self._f.seek(0)
+        data = self._f.read(size)
+
+        for height in range(size // HEADER_SIZE):
+            self._tip_hash = double_sha256(data[height * HEADER_SIZE:(height + 1) * HEADER_SIZE])
+            self._height_for_hash[self._tip_hash] = height
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.close()
+
+    def __len__(self):
+        return len(self._height_for_hash)
+
+    @property
+    def height(self):
+        """Height of the last header, -1 for the empty store."""
+        return len(self) - 1
+
+    def tip_hash(self):
+        return self._tip_hash
+
+    def header_bin(self, height):
+        if not 0 <= height < len(self):
+            raise IndexError("no header for height %d" % height)
+
+        self._f.seek(height * HEADER_SIZE)
+        return self._f.read(HEADER_SIZE)
+
+    def header(self, height):
+        """Return the header for height as a Block without transactions."""
+        return Block.parse_as_header(io.BytesIO(self.header_bin(height)))
+
+    def hash_for_height(self, height):
+        return double_sha256(self.header_bin(height))
+
+    def height_for_hash(self, header_hash):
+        """Return the height of the header or None if it's not in the store."""
+        if isinstance(header_hash, str):
+            header_hash = h2b_rev(header_hash)
+
+        return self._height_for_hash.get(header_hash)
+
+    def extend(self, headers_bin):
+        """
+        Verify and append headers (80-byte serialized blocks headers).
+        Nothing is appended if any of the headers is bad.
+        """
+        headers_bin = list(headers_bin)
+        tip_hash = self._tip_hash
+        hashes = []
+
+        for header_bin in headers_bin:
+            if len(header_bin) != HEADER_SIZE:
+                raise BadHeaderError("header size is %d" % len(header_bin))
+
+            header_hash = double_sha256(header_bin)
+
+            if self.verify:
+                header = Block.parse_as_header(io.BytesIO(header_bin))
+                if tip_hash is not None and header.previous_block_hash != tip_hash:
+                    raise BadHeaderError("header %s does not link to %s" % (
+                        b2h_rev(header_hash), b2h_rev(tip_hash)))
+
+                check_header_pow(header_hash, header.difficulty)
+
+            hashes.append(header_hash)
+            tip_hash = header_hash
+
+        self._f.seek(len(self) * HEADER_SIZE)
+        self._f.write(b''.join(headers_bin))
+        self._f.flush()
+
+        for header_hash in hashes:
+            self._height_for_hash[header_hash] = len(self._height_for_hash)
+
+        self._tip_hash = tip_hash
+
+    def truncate(self, height):
+        """Drop the headers from height to the tip (e.g. after reorg)."""
+        for h in range(self.height, max(height, 0) - 1, -1):
+            del self._height_for_hash[self.hash_for_height(h)]
+
+        self._f.truncate(len(self) * HEADER_SIZE)
+        self._f.flush()
+        self._tip_hash = self.hash_for_height(self.height) if len(self) else None
+
+    def close(self):
+        self._f.close()
@@ -48,6 +48,8 @@ import struct
 from .. import ecdsa
 
 from ..encoding import public_pair_to_sec, from_bytes_32, to_bytes_32
+from ..ecdsa.ecdsa import LIBSECP256K1
+from ..ecdsa import ellipticcurve
 from ..ecdsa.ellipticcurve import INFINITY
 
 logger = logging.getLogger(__name__)
@@ -142,21 +144,77 @@ def subkey_public_pair_chain_code_pair(public_pair, chain_code_bytes, i):
     I64 = hmac.HMAC(key=chain_code_bytes, msg=data, digestmod=hashlib.sha512).digest()
 
     I_left_as_exponent = from_bytes_32(I64[:32])
-    x, y = public_pair
 
-    the_point = I_left_as_exponent * ecdsa.generator_secp256k1 + \
-        ecdsa.Point(ecdsa.generator_secp256k1.curve(), x, y, ORDER)
+    # libsecp256k1 adds I_L * G to the point with its pubkey tweak.
+    new_public_pair = None
+    if LIBSECP256K1 and I_left_as_exponent < ORDER:
+        new_public_pair = LIBSECP256K1.public_pair_add_multiple(public_pair, I_left_as_exponent)
 
-    if the_point == INFINITY:
-        logger.critical(_SUBKEY_VALIDATION_LOG_ERR_FMT)
-        raise DerivationError('K_{} == {}'.format(i, the_point))
+    if new_public_pair is None:
+        x, y = public_pair
+
+        the_point = I_left_as_exponent * ecdsa.generator_secp256k1 + \
+            ecdsa.Point(ecdsa.generator_secp256k1.curve(), x, y, ORDER)
+
+        if the_point == INFINITY:
+            logger.critical(_SUBKEY_VALIDATION_LOG_ERR_FMT)
+            raise DerivationError('K_{} == {}'.format(i, the_point))
+
+        new_public_pair = the_point.pair()
 
-    I_left_as_exponent = from_bytes_32(I64[:32])
     if I_left_as_exponent >= ORDER:
         logger.critical(_SUBKEY_VALIDATION_LOG_ERR_FMT)
         raise DerivationError('I_L >= {}'.format(ORDER))
 
-    new_public_pair = the_point.pair()
     new_chain_code = I64[32:]
 
     return new_public_pair, new_chain_code
+
+
+def subkeys_public_pair_chain_code_pairs(public_pair, chain_code_bytes, indices):
+    """
+    Return the list of (new_public_pair, new_chain_code) for every index in
+    indices, as subkey_public_pair_chain_code_pair does. The new points are
+    converted to affine coordinates with a single inversion for all of them.
+    """
+    indices = list(indices)
+
+    if LIBSECP256K1 or ellipticcurve.NATIVE_LIBRARY:
+        return [subkey_public_pair_chain_code_pair(public_pair, chain_code_bytes, i) for i in indices]
+
+    sec = public_pair_to_sec(public_pair, compressed=True)
+    G = ecdsa.generator_secp256k1
+    p = G.curve().p()
+    a = G.curve().a()
+    x, y = public_pair
+
+    # Check the point once, as ecdsa.Point does for every subkey_public_pair_chain_code_pair.
+    ecdsa.Point(G.curve(), x, y, ORDER)
+
+    points = []
+    chain_codes = []
+
+    for i in indices:
+        I64 = hmac.HMAC(key=chain_code_bytes, msg=sec + struct.pack(">l", i), digestmod=hashlib.sha512).digest()
+        I_left_as_exponent = from_bytes_32(I64[:32])
+
+        if I_left_as_exponent >= ORDER:
+            logger.critical(_SUBKEY_VALIDATION_LOG_ERR_FMT)
+            raise DerivationError('I_L >= {}'.format(ORDER))
+
+        if I_left_as_exponent:
+            X, Y, Z = G._mul_jacobian(I_left_as_exponent)
+            points.append(ellipticcurve.jacobian_add_affine(X, Y, Z, x, y, p, a))
+        else:
+            points.append((x, y, 1))
+
+        chain_codes.append(I64[32:])
+
+    new_public_pairs = ellipticcurve.jacobian_to_affine_many(points, p)
+
+    for i, new_public_pair in zip(indices, new_public_pairs):
+        if new_public_pair is None:
+            logger.critical(_SUBKEY_VALIDATION_LOG_ERR_FMT)
+            raise DerivationError('K_{} == {}'.format(i, INFINITY))
+
+    return list(zip(new_public_pairs, chain_codes))
@@ -5,6 +5,11 @@ from . import bytes_as_revhex
 from .streamer import Streamer
 
 
+UINT16 = struct.Struct("<H")
+UINT32 = struct.Struct("<L")
+UINT64 = struct.Struct("<Q")
+
+
 def parse_bc_int(f, v=None):
     if v is None:
         v = ord(f.read(1))
@@ -26,6 +31,32 @@ def parse_bc_string(f):
     return f.read(size)
 
 
+def parse_bc_int_from_buffer(data, offset):
+    """Return (value, offset after it) for the variable length int at offset of bytes or memoryview."""
+    v = data[offset]
+
+    if v < 253:
+        return v, offset + 1
+
+    if v == 253:
+        return UINT16.unpack_from(data, offset + 1)[0], offset + 3
+
+    if v == 254:
+        return UINT32.unpack_from(data, offset + 1)[0], offset + 5
+
+    return UINT64.unpack_from(data, offset + 1)[0], offset + 9
+
+
+def parse_bc_string_from_buffer(data, offset):
+    size, offset = parse_bc_int_from_buffer(data, offset)
+    end = offset + size
+
+    if end > len(data):
+        raise ValueError("string runs past the end of buffer")
+
+    return bytes(data[offset:end]), end
+
+
 def stream_bc_int(f, v):
     if v < 253:
         f.write(struct.pack("<B", v))
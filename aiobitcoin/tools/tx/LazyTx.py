@@ -0,0 +1,210 @@
+"""
+Tx which decodes its inputs and outputs only when they are accessed.
+
+
+The MIT License (MIT)
+
+Copyright (c) 2019 by mkbeh
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+from ..serialize.bitcoin_streamer import parse_bc_int_from_buffer, UINT32
+
+from .changes import Changes
+from .Tx import Tx
+
+
+def _skip_txs_in(data, offset):
+    count, offset = parse_bc_int_from_buffer(data, offset)
+
+    for i in range(count):
+        size, offset = parse_bc_int_from_buffer(data, offset + 36)
+        offset += size + 4
+
+    return count, offset
+
+
+def _skip_txs_out(data, offset):
+    count, offset = parse_bc_int_from_buffer(data, offset)
+
+    for i in range(count):
+        size, offset = parse_bc_int_from_buffer(data, offset + 8)
+        offset += size
+
+    return offset
+
+
+def _skip_witnesses(data, offset, count):
+    for i in range(count):
+        items_count, offset = parse_bc_int_from_buffer(data, offset)
+        for j in range(items_count):
+            size, offset = parse_bc_int_from_buffer(data, offset)
+            offset += size
+
+    return offset
+
+
+class LazyTx(Tx):
+    """
+    Drop-in replacement of Tx for scanning many transactions. parse_from_buffer
+    (and so from_bin) only records where inputs, outputs and witnesses are in
+    the original bytes; txs_in (with witnesses) and txs_out are decoded on the
+    first access. Until the tx is changed hash(), w_hash(), id(), as_bin(),
+    size() and weight() use the original bytes, reading decoded fields doesn't
+    change that.
+    """
+
+    _blob = None
+    _txs_in = None
+    _txs_out = None
+    # State of the tx when it was parsed, see _is_pristine.
+    _parsed_state = None
+
+    @classmethod
+    def parse_from_buffer(class_, data, offset=0, allow_segwit=None):
+        if allow_segwit is None:
+            allow_segwit = class_.ALLOW_SEGWIT
+
+        start = offset
+        version, = UINT32.unpack_from(data, offset)
+        offset += 4
+        is_segwit = False
+
+        if allow_segwit and data[offset] == 0:
+            flag = data[offset + 1]
+            if flag == 0:
+                raise ValueError("bad flag in segwit")
+            if flag == 1:
+                is_segwit = True
+                offset += 2
+
+        txs_in_offset = offset
+        txs_in_count, offset = _skip_txs_in(data, offset)
+        txs_out_offset = offset
+        offset = _skip_txs_out(data, offset)
+        witnesses_offset = None
+
+        if is_segwit:
+            witnesses_offset = offset
+            offset = _skip_witnesses(data, offset, txs_in_count)
+
+        # Raises struct.error if the data was truncated.
+        lock_time, = UINT32.unpack_from(data, offset)
+        offset += 4
+
+        blob = bytes(data[start:offset])
+        cache = {'bin': blob}
+        if witnesses_offset is None:
+            cache['bin_no_witness'] = blob
+
+        tx = class_.__new__(class_)
+        tx.__dict__.update(
+            _blob=blob, _txs_in_offset=txs_in_offset - start, _txs_out_offset=txs_out_offset - start,
+            _witnesses_offset=None if witnesses_offset is None else witnesses_offset - start,
+            version=version, lock_time=lock_time, unspents=[], _cache=cache)
+        tx._cache_state = tx._parsed_state = tx._state()
+
+        return tx, offset
+
+    def _state(self):
+        # Inputs and outputs which aren't decoded yet can't be changed.
+        txs_in, txs_out = self._txs_in, self._txs_out
+        is_decoded = txs_in is not None or txs_out is not None
+
+        return (
+            Changes.fields if is_decoded else None, self.version, self.lock_time,
+            txs_in, None if txs_in is None else len(txs_in),
+            txs_out, None if txs_out is None else len(txs_out),
+        )
+
+    def _set_decoded(self, name, value):
+        # Decoding doesn't change the tx, so the memoized values stay valid.
+        is_valid = self._cache is not None and self._state() == self._cache_state
+        self.__dict__[name] = value
+
+        if is_valid:
+            state = self._state()
+            if self._parsed_state is self._cache_state:
+                self._parsed_state = state
+            self._cache_state = state
+
+    def _is_pristine(self):
+        # The original bytes are the serialized form while the memoized values are the parsed ones.
+        return self._parsed_state is not None and self._parsed_state is self._cache_state and (
+            self._state() == self._cache_state)
+
+    @property
+    def txs_in(self):
+        if self._txs_in is None and self._blob is not None:
+            txs_in, offset = self._parse_txs_in_from_buffer(self._blob, self._txs_in_offset)
+
+            if self._witnesses_offset is not None:
+                witnesses, offset = self._parse_witnesses_from_buffer(
+                    self._blob, self._witnesses_offset, len(txs_in))
+                for tx_in, witness in zip(txs_in, witnesses):
+                    # Not a change of the tx, see TxIn.from_fields.
+                    tx_in.__dict__['witness'] = witness
+
+            self._set_decoded('_txs_in', txs_in)
+
+        return self._txs_in
+
+    @txs_in.setter
+    def txs_in(self, txs_in):
+        self._txs_in = txs_in
+
+    @property
+    def txs_out(self):
+        if self._txs_out is None and self._blob is not None:
+            txs_out, offset = self._parse_txs_out_from_buffer(self._blob, self._txs_out_offset)
+            self._set_decoded('_txs_out', txs_out)
+
+        return self._txs_out
+
+    @txs_out.setter
+    def txs_out(self, txs_out):
+        self._txs_out = txs_out
+
+    def as_bin(self, include_unspents=False, include_witness_data=True):
+        if not include_unspents and not include_witness_data and self._is_pristine():
+            blob = self._blob
+            return self._cached('bin_no_witness', lambda: (
+                blob[:4] + blob[self._txs_in_offset:self._witnesses_offset] + blob[-4:]))
+
+        return super(LazyTx, self).as_bin(
+            include_unspents=include_unspents, include_witness_data=include_witness_data)
+
+    def size(self):
+        if not self._is_pristine():
+            return super(LazyTx, self).size()
+
+        return len(self._blob)
+
+    def weight(self):
+        if not self._is_pristine():
+            return super(LazyTx, self).weight()
+
+        if self._witnesses_offset is None:
+            return len(self._blob) * 4
+
+        # Version and lock time around inputs and outputs, no marker, flag and witnesses.
+        non_witness_size = self._witnesses_offset - self._txs_in_offset + 8
+
+        return non_witness_size * 3 + len(self._blob)
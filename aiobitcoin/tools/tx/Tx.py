@@ -29,17 +29,23 @@ THE SOFTWARE.
 import io
 import warnings
 
+from concurrent.futures import ProcessPoolExecutor
+
+from .. import ecdsa
 from ..convention import SATOSHI_PER_COIN
+from ..executor import get_default_crypto_executor
 from ..encoding import double_sha256, from_bytes_32
-from ..serialize import b2h, b2h_rev, h2b, h2b_rev
+from ..serialize import b2h, b2h_rev, h2b, h2b_rev, bytes_as_revhex
 from ..serialize.bitcoin_streamer import (
     parse_struct, parse_bc_int, parse_bc_string,
-    stream_struct, stream_bc_string
+    parse_bc_int_from_buffer,
+    stream_struct, stream_bc_int, stream_bc_string, UINT32, UINT64
 )
 from ..intbytes import byte2int, indexbytes, int2byte
 
+from .changes import Changes
 from .exceptions import BadSpendableError, ValidationFailureError
-from .TxIn import TxIn
+from .TxIn import TxIn, OUTPOINT
 from .TxOut import TxOut
 from .Spendable import Spendable
 
@@ -47,6 +53,8 @@ from .exceptions import SolvingError
 from .pay_to import script_obj_from_script, ScriptPayToScript
 from .script import opcodes
 from .script import tools
+from .script.check_signature import SignatureBatch
+from .script.sigcache import SIGNATURE_CACHE
 
 
 MAX_MONEY = 21000000 * SATOSHI_PER_COIN
@@ -59,6 +67,14 @@ SIGHASH_ANYONECANPAY = 0x80
 
 ZERO32 = b'\0' * 32
 
+# Input of a legacy signature hash preimage with the script blanked out.
+BLANK_TX_IN_SIZE = 41
+# Output before the signed one in a SIGHASH_SINGLE preimage: value of -1 and an empty script.
+NULL_TX_OUT_BIN = b'\xff' * 8 + b'\0'
+
+# Signatures sent to an executor worker at once by sign_many.
+SIGN_CHUNK_SIZE = 64
+
 
 class Tx(object):
     TxIn = TxIn
@@ -75,6 +91,13 @@ class Tx(object):
 
     ALLOW_SEGWIT = True
 
+    # Memoized serialized form and hashes with the state of the tx they are valid for, see _cached.
+    _cache = None
+    _cache_state = None
+    # Parts of signature hashes shared by all inputs, see _memoized.
+    _midstates = None
+    _midstates_state = None
+
     @classmethod
     def coinbase_tx(cls, public_key_sec, coin_value, coinbase_bytes=b'', version=1, lock_time=0):
         """
@@ -129,19 +152,130 @@ class Tx(object):
                 count = parse_bc_int(f)
                 for i in range(count):
                     stack.append(parse_bc_string(f))
-                tx_in.witness = stack
+                # Not a change of the tx, see TxIn.from_fields.
+                tx_in.__dict__['witness'] = tuple(stack)
 
         lock_time, = parse_struct("L", f)
         return class_(version, txs_in, txs_out, lock_time)
 
+    @classmethod
+    def parse_from_buffer(class_, data, offset=0, allow_segwit=None):
+        """
+        Parse a Bitcoin transaction Tx from bytes or memoryview at offset without
+        going through a file-like object. Return (tx, offset after the tx).
+        """
+        if allow_segwit is None:
+            allow_segwit = class_.ALLOW_SEGWIT
+
+        start = offset
+        version, = UINT32.unpack_from(data, offset)
+        offset += 4
+        is_segwit = False
+
+        if allow_segwit and data[offset] == 0:
+            flag = data[offset + 1]
+            if flag == 0:
+                raise ValueError("bad flag in segwit")
+            if flag == 1:
+                is_segwit = True
+                offset += 2
+
+        txs_in, offset = class_._parse_txs_in_from_buffer(data, offset)
+        txs_out, offset = class_._parse_txs_out_from_buffer(data, offset)
+
+        if is_segwit:
+            witnesses, offset = class_._parse_witnesses_from_buffer(data, offset, len(txs_in))
+            for tx_in, witness in zip(txs_in, witnesses):
+                # Not a change of the tx, see TxIn.from_fields.
+                tx_in.__dict__['witness'] = witness
+
+        # Raises struct.error if the data was truncated.
+        lock_time, = UINT32.unpack_from(data, offset)
+        end = offset + 4
+        tx = class_(version, txs_in, txs_out, lock_time)
+        # The parsed bytes are the serialized form until the tx is changed.
+        blob = bytes(data[start:end])
+        tx._cache = {'bin': blob}
+        tx._cache_state = tx._state()
+        if not is_segwit:
+            tx._cache['bin_no_witness'] = blob
+
+        return tx, end
+
+    # Variable length ints are almost always one byte, so the common case is inlined below.
+
+    @classmethod
+    def _parse_txs_in_from_buffer(class_, data, offset):
+        from_fields = class_.TxIn.from_fields
+        unpack_outpoint = OUTPOINT.unpack_from
+        unpack_uint32 = UINT32.unpack_from
+        count, offset = parse_bc_int_from_buffer(data, offset)
+        txs_in = []
+
+        for i in range(count):
+            previous_hash, previous_index = unpack_outpoint(data, offset)
+            size = data[offset + 36]
+            if size < 253:
+                offset += 37
+            else:
+                size, offset = parse_bc_int_from_buffer(data, offset + 36)
+            script = bytes(data[offset:offset + size])
+            offset += size
+            sequence, = unpack_uint32(data, offset)
+            offset += 4
+            txs_in.append(from_fields(bytes_as_revhex(previous_hash), previous_index, script, sequence))
+
+        return txs_in, offset
+
+    @classmethod
+    def _parse_txs_out_from_buffer(class_, data, offset):
+        from_fields = class_.TxOut.from_fields
+        unpack_uint64 = UINT64.unpack_from
+        count, offset = parse_bc_int_from_buffer(data, offset)
+        txs_out = []
+
+        for i in range(count):
+            coin_value, = unpack_uint64(data, offset)
+            size = data[offset + 8]
+            if size < 253:
+                offset += 9
+            else:
+                size, offset = parse_bc_int_from_buffer(data, offset + 8)
+            script = bytes(data[offset:offset + size])
+            offset += size
+            txs_out.append(from_fields(coin_value, script))
+
+        return txs_out, offset
+
+    @staticmethod
+    def _parse_witnesses_from_buffer(data, offset, count):
+        witnesses = []
+
+        for i in range(count):
+            stack = []
+            items_count, offset = parse_bc_int_from_buffer(data, offset)
+            for j in range(items_count):
+                size = data[offset]
+                if size < 253:
+                    offset += 1
+                else:
+                    size, offset = parse_bc_int_from_buffer(data, offset)
+                stack.append(bytes(data[offset:offset + size]))
+                offset += size
+            witnesses.append(tuple(stack))
+
+        return witnesses, offset
+
     @classmethod
     def from_bin(cls, blob):
         """Return the Tx for the given binary blob."""
-        f = io.BytesIO(blob)
-        tx = cls.parse(f)
+        tx, offset = cls.parse_from_buffer(blob)
+
+        if offset == len(blob):
+            return tx
 
         try:
-            tx.parse_unspents(f)
+            tx.parse_unspents(io.BytesIO(blob[offset:]))
         except Exception:
             # parsing unspents failed
             tx.unspents = []
@@ -203,13 +337,56 @@ class Tx(object):
         if include_unspents and not self.missing_unspents():
             self.stream_unspents(f)
 
-    def as_bin(self, include_unspents=False, include_witness_data=True):
-        """Return the transaction as binary."""
+    def _state(self):
+        # Everything the memoized values depend on. It's built in O(1): lists are compared
+        # by identity and length, changes of their items are counted (see changes.py).
+        return (
+            Changes.fields, self.version, self.lock_time,
+            self.txs_in, len(self.txs_in), self.txs_out, len(self.txs_out),
+        )
+
+    def invalidate_caches(self):
+        """
+        Drop the memoized serialized form, hashes and signature hash midstates.
+        Changes of the tx are noticed without it, except the same TxIn or TxOut
+        objects reordered in place in txs_in or txs_out.
+        """
+        self._cache = None
+        self._midstates = None
+
+    def _cached(self, key, f):
+        """
+        Return the value memoized under key, computing it with f() if it is missing
+        or if the tx was changed since the values were memoized.
+        """
+        state = self._state()
+
+        if self._cache is None or state != self._cache_state:
+            self._cache = {}
+            self._cache_state = state
+
+        value = self._cache.get(key)
+        if value is None:
+            value = self._cache[key] = f()
+
+        return value
+
+    def _stream_to_bin(self, include_unspents=False, include_witness_data=True):
         f = io.BytesIO()
         self.stream(f, include_unspents=include_unspents, include_witness_data=include_witness_data)
 
         return f.getvalue()
 
+    def as_bin(self, include_unspents=False, include_witness_data=True):
+        """Return the transaction as binary."""
+        if include_unspents:
+            return self._stream_to_bin(include_unspents=True, include_witness_data=include_witness_data)
+
+        if include_witness_data:
+            return self._cached('bin', self._stream_to_bin)
+
+        return self._cached('bin_no_witness', lambda: self._stream_to_bin(include_witness_data=False))
+
     def as_hex(self, include_unspents=False, include_witness_data=True):
         """Return the transaction as hex."""
         return b2h(self.as_bin(
@@ -223,6 +400,9 @@ class Tx(object):
 
     def hash(self, hash_type=None):
         """Return the hash for this Tx object."""
+        if hash_type is None:
+            return self._cached('hash', lambda: double_sha256(self.as_bin(include_witness_data=False)))
+
         s = io.BytesIO()
         self.stream(s, include_witness_data=False)
 
@@ -232,7 +412,19 @@ class Tx(object):
         return double_sha256(s.getvalue())
 
     def w_hash(self):
-        return double_sha256(self.as_bin())
+        return self._cached('w_hash', lambda: double_sha256(self.as_bin()))
+
+    def size(self):
+        """Return the size of the serialized transaction (with witnesses) in bytes."""
+        return self._cached('size', lambda: len(self.as_bin()))
+
+    def weight(self):
+        """Return the transaction weight as defined in BIP141."""
+        return self._cached('weight', lambda: len(self.as_bin(include_witness_data=False)) * 3 + self.size())
+
+    def vsize(self):
+        """Return the virtual size (weight / 4 rounded up)."""
+        return (self.weight() + 3) // 4
 
     def w_id(self):
         return b2h_rev(self.w_hash())
@@ -252,12 +444,6 @@ class Tx(object):
         """Return the human-readable hash for this Tx object."""
         return b2h_rev(self.hash())
 
-    def _tx_in_for_idx(self, idx, tx_in, tx_out_script, unsigned_txs_out_idx):
-        if idx == unsigned_txs_out_idx:
-            return self.TxIn(tx_in.previous_hash, tx_in.previous_index, tx_out_script, tx_in.sequence)
-
-        return self.TxIn(tx_in.previous_hash, tx_in.previous_index, b'', tx_in.sequence)
-
     def signature_hash(self, tx_out_script, unsigned_txs_out_idx, hash_type):
         """
         Return the canonical hash for a transaction. We need to
@@ -274,64 +460,121 @@ class Tx(object):
         # or an extra one at the end, this prevents all those possible incompatibilities.
         tx_out_script = tools.delete_subscript(tx_out_script, int2byte(opcodes.OP_CODESEPARATOR))
 
-        # blank out other inputs' signatures
-        txs_in = [self._tx_in_for_idx(i, tx_in, tx_out_script, unsigned_txs_out_idx)
-                  for i, tx_in in enumerate(self.txs_in)]
-        txs_out = self.txs_out
-
-        # Blank out some of the outputs
-        if (hash_type & 0x1f) == self.SIGHASH_NONE:
-            # Wildcard payee
-            txs_out = []
+        base_type = hash_type & 0x1f
 
-            # Let the others update at will
-            for i in range(len(txs_in)):
-                if i != unsigned_txs_out_idx:
-                    txs_in[i].sequence = 0
-
-        elif (hash_type & 0x1f) == self.SIGHASH_SINGLE:
+        if base_type == self.SIGHASH_SINGLE and unsigned_txs_out_idx >= len(self.txs_out):
             # This preserves the ability to validate existing legacy
             # transactions which followed a buggy path in Satoshi's
             # original code; note that higher level functions for signing
             # new transactions (e.g., is_signature_ok and sign_tx_in)
             # check to make sure we never get here (or at least they
             # should)
-            if unsigned_txs_out_idx >= len(txs_out):
-                # This should probably be moved to a constant, but the
-                # likelihood of ever getting here is already really small
-                # and getting smaller
-                return (1 << 248)
-
-            # Only lock in the txout payee at same index as txin; delete
-            # any outputs after this one and set all outputs before this
-            # one to "null" (where "null" means an empty script and a
-            # value of -1)
-            txs_out = [self.TxOut(0xffffffffffffffff, b'')] * unsigned_txs_out_idx
-            txs_out.append(self.txs_out[unsigned_txs_out_idx])
-
-            # Let the others update at will
-            for i in range(len(self.txs_in)):
-                if i != unsigned_txs_out_idx:
-                    txs_in[i].sequence = 0
-
-        # Blank out other inputs completely, not recommended for open transactions
+            return (1 << 248)
+
+        return from_bytes_32(double_sha256(self._legacy_signature_preimage(
+            tx_out_script, unsigned_txs_out_idx, hash_type)))
+
+    def _legacy_signature_preimage(self, tx_out_script, unsigned_txs_out_idx, hash_type):
+        """
+        Stream the transaction the way signature_hash needs it (other inputs'
+        scripts blanked, tx_out_script in the signed input, outputs and
+        sequences according to hash_type) without building a temporary Tx.
+        """
+        base_type = hash_type & 0x1f
+        # With SIGHASH_NONE and SIGHASH_SINGLE other inputs are free to update their sequences.
+        keep_sequences = base_type not in (self.SIGHASH_NONE, self.SIGHASH_SINGLE)
+        tx_in = self.txs_in[unsigned_txs_out_idx]
+
+        f = io.BytesIO()
+        f.write(UINT32.pack(self.version))
+
         if hash_type & self.SIGHASH_ANYONECANPAY:
-            txs_in = [txs_in[unsigned_txs_out_idx]]
+            # Blank out other inputs completely, not recommended for open transactions
+            stream_bc_int(f, 1)
+            self._stream_signed_tx_in(f, tx_in, tx_out_script)
+        else:
+            # Every blanked input is 41 bytes: outpoint, empty script and sequence.
+            blank_txs_in = self._blank_txs_in_bin(keep_sequences)
+            start = unsigned_txs_out_idx * BLANK_TX_IN_SIZE
+
+            stream_bc_int(f, len(self.txs_in))
+            f.write(blank_txs_in[:start])
+            self._stream_signed_tx_in(f, tx_in, tx_out_script)
+            f.write(blank_txs_in[start + BLANK_TX_IN_SIZE:])
+
+        if base_type == self.SIGHASH_NONE:
+            # Wildcard payee
+            stream_bc_int(f, 0)
+        elif base_type == self.SIGHASH_SINGLE:
+            # Only lock in the txout payee at same index as txin; outputs before
+            # this one are "null" (an empty script and a value of -1)
+            stream_bc_int(f, unsigned_txs_out_idx + 1)
+            f.write(NULL_TX_OUT_BIN * unsigned_txs_out_idx)
+            self.txs_out[unsigned_txs_out_idx].stream(f)
+        else:
+            f.write(self._txs_out_bin_all())
+
+        f.write(UINT32.pack(self.lock_time))
+        f.write(UINT32.pack(hash_type))
+
+        return f.getvalue()
 
-        tmp_tx = self.__class__(self.version, txs_in, txs_out, self.lock_time)
-        return from_bytes_32(tmp_tx.hash(hash_type=hash_type))
+    def _txs_out_bin_all(self):
+        """Serialized outputs with their count, shared by SIGHASH_ALL preimages of all inputs."""
+        def stream_txs_out():
+            f = io.BytesIO()
+            stream_bc_int(f, len(self.txs_out))
+            for tx_out in self.txs_out:
+                tx_out.stream(f)
+
+            return f.getvalue()
+
+        return self._memoized('txs_out_bin', stream_txs_out)
+
+    @staticmethod
+    def _stream_signed_tx_in(f, tx_in, tx_out_script):
+        f.write(OUTPOINT.pack(tx_in.previous_hash, tx_in.previous_index))
+        stream_bc_string(f, tx_out_script)
+        f.write(UINT32.pack(tx_in.sequence))
+
+    def _blank_txs_in_bin(self, keep_sequences):
+        if keep_sequences:
+            return self._memoized('blank_txs_in', lambda: b''.join(
+                OUTPOINT.pack(t.previous_hash, t.previous_index) + b'\0' + UINT32.pack(t.sequence)
+                for t in self.txs_in))
+
+        return self._memoized('blank_txs_in_zero_sequences', lambda: b''.join(
+            OUTPOINT.pack(t.previous_hash, t.previous_index) + b'\0\0\0\0\0' for t in self.txs_in))
+
+    def _signed_state(self):
+        # Everything the midstates depend on, solutions of the inputs aren't a part of it. It's built
+        # in O(1): lists are compared by identity and length, changes of their items are counted.
+        return Changes.signed_fields, self.txs_in, len(self.txs_in), self.txs_out, len(self.txs_out)
+
+    def _memoized(self, key, f):
+        """
+        Return f() memoized under key until outpoints, sequences or outputs are
+        changed. Unlike _cached, values survive changes of solutions during
+        signing, so they are computed once for all the inputs.
+        """
+        state = self._signed_state()
+
+        if self._midstates is None or state != self._midstates_state:
+            self._midstates = {}
+            self._midstates_state = state
+
+        value = self._midstates.get(key)
+        if value is None:
+            value = self._midstates[key] = f()
+
+        return value
 
     def hash_prevouts(self, hash_type):
         if hash_type & SIGHASH_ANYONECANPAY:
             return ZERO32
 
-        f = io.BytesIO()
-
-        for tx_in in self.txs_in:
-            f.write(tx_in.previous_hash)
-            stream_struct("L", f, tx_in.previous_index)
-
-        return double_sha256(f.getvalue())
+        return self._memoized('hash_prevouts', lambda: double_sha256(b''.join(
+            OUTPOINT.pack(tx_in.previous_hash, tx_in.previous_index) for tx_in in self.txs_in)))
 
     def hash_sequence(self, hash_type):
         if (
@@ -341,12 +584,18 @@ class Tx(object):
         ):
             return ZERO32
 
+        return self._memoized('hash_sequence', lambda: double_sha256(b''.join(
+            UINT32.pack(tx_in.sequence) for tx_in in self.txs_in)))
+
+    @staticmethod
+    def _txs_out_bin(txs_out):
         f = io.BytesIO()
 
-        for tx_in in self.txs_in:
-            stream_struct("L", f, tx_in.sequence)
+        for tx_out in txs_out:
+            stream_struct("Q", f, tx_out.coin_value)
+            tools.write_push_data([tx_out.script], f)
 
-        return double_sha256(f.getvalue())
+        return f.getvalue()
 
     def hash_outputs(self, hash_type, tx_in_idx):
         txs_out = self.txs_out
@@ -355,17 +604,11 @@ class Tx(object):
             if tx_in_idx >= len(txs_out):
                 return ZERO32
 
-            txs_out = txs_out[tx_in_idx:tx_in_idx+1]
+            return double_sha256(self._txs_out_bin(txs_out[tx_in_idx:tx_in_idx+1]))
         elif hash_type & 0x1f == SIGHASH_NONE:
             return ZERO32
 
-        f = io.BytesIO()
-
-        for tx_out in txs_out:
-            stream_struct("Q", f, tx_out.coin_value)
-            tools.write_push_data([tx_out.script], f)
-
-        return double_sha256(f.getvalue())
+        return self._memoized('hash_outputs', lambda: double_sha256(self._txs_out_bin(txs_out)))
 
     def segwit_signature_preimage(self, script, tx_in_idx, hash_type):
         f = io.BytesIO()
@@ -389,7 +632,7 @@ class Tx(object):
     def signature_for_hash_type_segwit(self, script, tx_in_idx, hash_type):
         return from_bytes_32(double_sha256(self.segwit_signature_preimage(script, tx_in_idx, hash_type)))
 
-    def solve(self, hash160_lookup, tx_in_idx, tx_out_script, hash_type=None, **kwargs):
+    def solve(self, hash160_lookup, tx_in_idx, tx_out_script, hash_type=None, signatures=None, **kwargs):
         """
         Sign a standard transaction.
         hash160_lookup:
@@ -401,6 +644,10 @@ class Tx(object):
             the index of the tx_in we are currently signing
         tx_out:
             the tx_out referenced by the given tx_in
+        signatures:
+            optional dict of (secret exponent, signature hash) => (r, s). Signatures
+            which aren't in it are added with None instead of being computed, and
+            the solution has placeholders for them (see sign_many).
         """
         if hash_type is None:
             hash_type = self.SIGHASH_ALL
@@ -434,6 +681,8 @@ class Tx(object):
 
         witness_signature_for_hash_type.skip_delete = True
         signature_for_hash_type_f.witness = witness_signature_for_hash_type
+        signature_for_hash_type_f.signatures = signatures
+        witness_signature_for_hash_type.signatures = signatures
 
         if tx_in.verify(
                 tx_out_script, signature_for_hash_type_f, lock_time=self.lock_time,
@@ -454,7 +703,9 @@ class Tx(object):
 
         r = self.solve(hash160_lookup, tx_in_idx, tx_out_script,
                        hash_type=hash_type, **kwargs)
+        self._set_solution(tx_in_idx, r)
 
+    def _set_solution(self, tx_in_idx, r):
         if isinstance(r, bytes):
             self.txs_in[tx_in_idx].script = r
         else:
@@ -501,7 +752,7 @@ class Tx(object):
             raise ValidationFailureError("txs_in = []")
 
     def _check_size_limit(self):
-        size = len(self.as_bin())
+        size = self.size()
 
         if size > self.MAX_TX_SIZE:
             raise ValidationFailureError("size > MAX_TX_SIZE")
@@ -622,7 +873,12 @@ class Tx(object):
 
         self.set_unspents(unspents)
 
-    def is_signature_ok(self, tx_in_idx, flags=None, traceback_f=None):
+    def is_signature_ok(self, tx_in_idx, flags=None, traceback_f=None, signature_batch=None):
+        """
+        Return True if the input script verifies. With a SignatureBatch, signatures are
+        added to it instead of being verified, and the result is only valid if all
+        the signatures in the batch are (see bad_signatures).
+        """
         tx_in = self.txs_in[tx_in_idx]
 
         if tx_in.is_coinbase():
@@ -645,22 +901,33 @@ class Tx(object):
 
         witness_signature_for_hash_type.skip_delete = True
         signature_for_hash_type_f.witness = witness_signature_for_hash_type
+        signature_for_hash_type_f.signature_batch = signature_batch
+        witness_signature_for_hash_type.signature_batch = signature_batch
 
         return tx_in.verify(
             tx_out_script, signature_for_hash_type_f, lock_time=self.lock_time,
             flags=flags, traceback_f=traceback_f, tx_version=self.version)
 
-    def sign(self, hash160_lookup, hash_type=None, **kwargs):
+    def sign(self, hash160_lookup, hash_type=None, executor=None, **kwargs):
         """
         Sign a standard transaction.
         hash160_lookup:
             A dictionary (or another object with .get) where keys are hash160 and
             values are tuples (secret exponent, public_pair, is_compressed) or None
             (in which case the script will obviously not be signed).
+        executor:
+            optional concurrent.futures.Executor computing the signatures, see sign_many.
         """
+        if executor is not None:
+            sign_many([self], hash160_lookup, hash_type=hash_type, executor=executor, **kwargs)
+            return self
+
         if hash_type is None:
             hash_type = self.SIGHASH_ALL
 
+        # Inputs or outputs reordered in place aren't noticed by _memoized.
+        self._midstates = None
+
         self.check_unspents()
         for idx, tx_in in enumerate(self.txs_in):
             if self.is_signature_ok(idx) or tx_in.is_coinbase():
@@ -674,6 +941,22 @@ class Tx(object):
 
         return self
 
+    async def sign_async(self, hash160_lookup, hash_type=None, crypto_executor=None, **kwargs):
+        """
+        Sign like sign in the CryptoExecutor (the default one if it's None), without
+        blocking the event loop. With a process pool, only the signatures are computed
+        in processes (see sign_many).
+        """
+        if crypto_executor is None:
+            crypto_executor = get_default_crypto_executor()
+
+        if crypto_executor.is_process_pool():
+            kwargs["executor"] = crypto_executor.executor
+
+        await crypto_executor.run_in_thread(self.sign, hash160_lookup, hash_type=hash_type, **kwargs)
+
+        return self
+
     def bad_signature_count(self, flags=None):
         count = 0
         for idx, tx_in in enumerate(self.txs_in):
@@ -682,6 +965,13 @@ class Tx(object):
 
         return count
 
+    def verify_signatures(self, flags=None):
+        """
+        Return the indices of inputs which signatures are not ok, like is_signature_ok,
+        but with the signatures of all the inputs verified together.
+        """
+        return [idx for tx, idx in bad_signatures([self], flags=flags)]
+
     def total_in(self):
         if self.is_coinbase():
             return self.txs_out[0].coin_value
@@ -745,3 +1035,102 @@ class Tx(object):
                 raise BadSpendableError("unspents[%d] script mismatch!" % idx)
 
         return self.fee()
+
+
+def _sign_values(requests):
+    """Return the signature of every (secret exponent, signature hash) in requests."""
+    return [ecdsa.sign(ecdsa.generator_secp256k1, secret_exponent, val) for secret_exponent, val in requests]
+
+
+def sign_many(txs, hash160_lookup, hash_type=None, executor=None, processes=None, **kwargs):
+    """
+    Sign the inputs of txs as Tx.sign does, with the signatures computed by
+    executor (a concurrent.futures.Executor), or by a ProcessPoolExecutor with
+    processes workers if it's None. Signature hashes and scripts are computed
+    here; only (secret exponent, signature hash) pairs are sent to the workers,
+    so hash160_lookup doesn't need to be picklable. Return txs.
+    """
+    if executor is None:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            return sign_many(txs, hash160_lookup, hash_type=hash_type, executor=executor, **kwargs)
+
+    to_sign = []
+
+    for tx in txs:
+        tx.check_unspents()
+        # Inputs or outputs reordered in place aren't noticed by _memoized.
+        tx._midstates = None
+
+        for idx, tx_in in enumerate(tx.txs_in):
+            if tx.is_signature_ok(idx) or tx_in.is_coinbase() or not tx.unspents[idx]:
+                continue
+
+            to_sign.append((tx, idx))
+
+    # Solutions are computed once to find what to sign, then again with the signatures.
+    signatures = {}
+
+    while True:
+        solutions = []
+
+        for tx, idx in to_sign:
+            try:
+                solution = tx.solve(
+                    hash160_lookup, idx, tx.unspents[idx].script, hash_type=hash_type,
+                    signatures=signatures, **kwargs)
+            except SolvingError:
+                continue
+
+            solutions.append((tx, idx, solution))
+
+        requests = [request for request, signature in signatures.items() if signature is None]
+        if not requests:
+            break
+
+        chunks = [requests[i:i + SIGN_CHUNK_SIZE] for i in range(0, len(requests), SIGN_CHUNK_SIZE)]
+        for chunk, chunk_signatures in zip(chunks, executor.map(_sign_values, chunks)):
+            signatures.update(zip(chunk, chunk_signatures))
+
+    for tx, idx, solution in solutions:
+        if solution is not None:
+            tx._set_solution(idx, solution)
+
+    return txs
+
+
+def bad_signatures(txs, flags=None):
+    """
+    Return (tx, tx_in_idx) for every input of txs which signatures are not ok.
+
+    Every input script is run once with a SignatureBatch, assuming that its
+    signatures are valid, then the signatures of all the inputs are verified
+    with ecdsa.verify_many. Results of inputs with valid signatures stand,
+    other inputs are verified again one by one. Multisig signatures are
+    matched to public keys while the script runs, so they are not batched.
+    """
+    runs = []
+    items = []
+
+    for tx in txs:
+        for idx in range(len(tx.txs_in)):
+            signature_batch = SignatureBatch()
+            is_ok = tx.is_signature_ok(idx, flags=flags, signature_batch=signature_batch)
+            runs.append((tx, idx, is_ok, len(items), len(items) + len(signature_batch.items)))
+            items.extend(signature_batch.items)
+
+    results = ecdsa.verify_many(ecdsa.generator_secp256k1, items)
+
+    for item, is_valid in zip(items, results):
+        if is_valid:
+            SIGNATURE_CACHE.add(*item)
+
+    bad = []
+
+    for tx, idx, is_ok, start, end in runs:
+        if not all(results[start:end]):
+            is_ok = tx.is_signature_ok(idx, flags=flags)
+
+        if not is_ok:
+            bad.append((tx, idx))
+
+    return bad
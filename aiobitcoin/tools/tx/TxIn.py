@@ -26,16 +26,26 @@ OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
 THE SOFTWARE.
 """
 
+import struct
+
 from .. import encoding
 
-from ..serialize import b2h, b2h_rev, h2b
-from ..serialize.bitcoin_streamer import parse_struct, stream_struct
+from ..serialize import b2h, b2h_rev, h2b, bytes_as_revhex
+from ..serialize.bitcoin_streamer import parse_bc_string, stream_struct, UINT32
 
+from .changes import field_changed
 from .script.tools import disassemble, opcode_list
 from .script.vm import verify_script
 
 ZERO = b'\0' * 32
 
+OUTPOINT = struct.Struct("<32sL")
+
+# Fields of the serialized input, changing them changes the memoized values of the Tx.
+FIELDS = frozenset(['previous_hash', 'previous_index', 'script', 'sequence', 'witness'])
+# Fields which the signature hashes of all the inputs depend on.
+SIGNED_FIELDS = frozenset(['previous_hash', 'previous_index', 'sequence'])
+
 
 class TxIn(object):
     """
@@ -49,6 +59,28 @@ class TxIn(object):
         self.sequence = sequence
         self.witness = ()
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+
+        if name in FIELDS:
+            field_changed(name in SIGNED_FIELDS)
+
+    @classmethod
+    def from_fields(cls, previous_hash, previous_index, script, sequence, witness=()):
+        """
+        Create a TxIn without going through __setattr__, for parsers: a new input
+        isn't a change of any transaction.
+        """
+        tx_in = cls.__new__(cls)
+        d = tx_in.__dict__
+        d['previous_hash'] = previous_hash
+        d['previous_index'] = previous_index
+        d['script'] = script
+        d['sequence'] = sequence
+        d['witness'] = witness
+
+        return tx_in
+
     @classmethod
     def coinbase_tx_in(cls, script):
         tx = cls(previous_hash=ZERO, previous_index=4294967295, script=script)
@@ -60,7 +92,11 @@ class TxIn(object):
 
     @classmethod
     def parse(cls, f):
-        return cls(*parse_struct("#LSL", f))
+        previous_hash, previous_index = OUTPOINT.unpack(f.read(36))
+        script = parse_bc_string(f)
+        sequence, = UINT32.unpack(f.read(4))
+
+        return cls.from_fields(bytes_as_revhex(previous_hash), previous_index, script, sequence)
 
     def is_coinbase(self):
         return self.previous_hash == ZERO
@@ -28,11 +28,15 @@ THE SOFTWARE.
 
 from ..convention import satoshi_to_mbtc
 
-from ..serialize.bitcoin_streamer import parse_struct, stream_struct
+from ..serialize.bitcoin_streamer import parse_bc_string, stream_struct, UINT64
 
+from .changes import field_changed
 from .pay_to import script_obj_from_script
 from .script import tools
 
+# Fields of the serialized output, changing them changes the memoized values of the Tx.
+FIELDS = frozenset(['coin_value', 'script'])
+
 
 class TxOut(object):
 
@@ -47,12 +51,34 @@ class TxOut(object):
         self.coin_value = self.COIN_VALUE_CAST_F(coin_value)
         self.script = script
 
+    def __setattr__(self, name, value):
+        object.__setattr__(self, name, value)
+
+        # Signature hashes of all the inputs can depend on the outputs.
+        if name in FIELDS:
+            field_changed(True)
+
+    @classmethod
+    def from_fields(cls, coin_value, script):
+        """
+        Create a TxOut without going through __setattr__, for parsers: a new output
+        isn't a change of any transaction.
+        """
+        tx_out = cls.__new__(cls)
+        d = tx_out.__dict__
+        d['coin_value'] = cls.COIN_VALUE_CAST_F(coin_value)
+        d['script'] = script
+
+        return tx_out
+
     def stream(self, f):
         stream_struct("QS", f, self.coin_value, self.script)
 
     @classmethod
     def parse(cls, f):
-        return cls(*parse_struct("QS", f))
+        coin_value, = UINT64.unpack(f.read(8))
+
+        return cls.from_fields(coin_value, parse_bc_string(f))
 
     def __str__(self):
         return '%s<%s mbtc "%s">' % (
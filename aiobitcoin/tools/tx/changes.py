@@ -0,0 +1,43 @@
+"""
+Counters of changes of TxIn and TxOut fields, shared by all the transactions.
+Tx memoizes its serialized form, hashes and signature hash midstates together
+with the counters, so changes of inputs and outputs in place
+(e.g. tx.txs_in[0].sequence = 0) are noticed without comparing every field.
+
+
+The MIT License (MIT)
+
+Copyright (c) 2019 by mkbeh
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+
+class Changes(object):
+    # Changes of any field the serialized tx depends on.
+    fields = 0
+    # Changes of outpoints, sequences and outputs, the signature hashes of all the inputs depend on them.
+    signed_fields = 0
+
+
+def field_changed(signed_by_all):
+    Changes.fields += 1
+
+    if signed_by_all:
+        Changes.signed_fields += 1
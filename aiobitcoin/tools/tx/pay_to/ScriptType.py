@@ -91,7 +91,17 @@ class ScriptType(object):
     def _create_script_signature(secret_exponent, signature_for_hash_type_f, signature_type, script):
         sign_value = signature_for_hash_type_f(signature_type, script)
         order = ecdsa.generator_secp256k1.order()
-        r, s = ecdsa.sign(ecdsa.generator_secp256k1, secret_exponent, sign_value)
+        # Tx.sign_many passes the signatures computed in other processes, see Tx.solve.
+        signatures = getattr(signature_for_hash_type_f, "signatures", None)
+
+        if signatures is None:
+            r, s = ecdsa.sign(ecdsa.generator_secp256k1, secret_exponent, sign_value)
+        elif signatures.get((secret_exponent, sign_value)) is None:
+            # Not signed yet: record what to sign, this solution will be computed again.
+            signatures[(secret_exponent, sign_value)] = None
+            r, s = order - 1, order // 2
+        else:
+            r, s = signatures[(secret_exponent, sign_value)]
 
         if s + s > order:
             s = order - s
@@ -41,6 +41,7 @@ from .flags import (
 )
 
 from .microcode import VCH_TRUE, VCH_FALSE
+from .sigcache import SIGNATURE_CACHE
 from .tools import bin_script, delete_subscript, int_from_script_bytes
 
 
@@ -156,6 +157,22 @@ def check_public_key_encoding(blob):
     raise ScriptError("invalid public key blob", errno.PUBKEYTYPE)
 
 
+class SignatureBatch(object):
+    """
+    Signatures to verify later, all together. If signature_for_hash_type_f has
+    a signature_batch, op_checksig adds (public_pair, signature_hash, sig_pair)
+    to it and goes on as if the signature was valid. The script result can
+    be trusted only if all the signatures in the batch are valid.
+    """
+
+    def __init__(self):
+        self.items = []
+
+    def add(self, public_pair, signature_hash, sig_pair):
+        self.items.append((public_pair, signature_hash, sig_pair))
+        return True
+
+
 def op_checksig(stack, signature_for_hash_type_f, expected_hash_type, tmp_script, flags):
     try:
         pair_blob = stack.pop()
@@ -184,8 +201,18 @@ def op_checksig(stack, signature_for_hash_type_f, expected_hash_type, tmp_script
         tmp_script = delete_subscript(tmp_script, bin_script([sig_blob]))
 
     signature_hash = signature_for_hash_type_f(signature_type, script=tmp_script)
+    signature_batch = getattr(signature_for_hash_type_f, "signature_batch", None)
+
+    if SIGNATURE_CACHE.contains(public_pair, signature_hash, sig_pair):
+        is_valid = True
+    elif signature_batch is not None:
+        is_valid = signature_batch.add(public_pair, signature_hash, sig_pair)
+    else:
+        is_valid = ecdsa.verify(ecdsa.generator_secp256k1, public_pair, signature_hash, sig_pair)
+        if is_valid:
+            SIGNATURE_CACHE.add(public_pair, signature_hash, sig_pair)
 
-    if ecdsa.verify(ecdsa.generator_secp256k1, public_pair, signature_hash, sig_pair):
+    if is_valid:
         stack.append(VCH_TRUE)
     else:
         if flags & VERIFY_NULLFAIL:
@@ -234,11 +261,9 @@ def sig_blob_matches(sig_blobs, public_pair_blobs, tmp_script, signature_for_has
         if signature_type not in sig_cache:
             sig_cache[signature_type] = signature_for_hash_type_f(signature_type, script=tmp_script)
 
-        try:
-            ppp = ecdsa.possible_public_pairs_for_signature(
-                ecdsa.generator_secp256k1, sig_cache[signature_type], sig_pair)
-        except ecdsa.NoSuchPointError:
-            ppp = []
+        signature_hash = sig_cache[signature_type]
+        # Public keys which could have made the signature, recovered if a key is not in SIGNATURE_CACHE.
+        ppp = None
 
         while len(sig_blobs) < len(public_pair_blobs):
             public_pair_blob, public_pair_blobs = public_pair_blobs[0], public_pair_blobs[1:]
@@ -256,7 +281,22 @@ def sig_blob_matches(sig_blobs, public_pair_blobs, tmp_script, signature_for_has
             except EncodingError:
                 public_pair = None
 
+            if public_pair is None:
+                continue
+
+            if SIGNATURE_CACHE.contains(public_pair, signature_hash, sig_pair):
+                sig_blob_indices.append(ppb_idx)
+                break
+
+            if ppp is None:
+                try:
+                    ppp = ecdsa.possible_public_pairs_for_signature(
+                        ecdsa.generator_secp256k1, signature_hash, sig_pair)
+                except ecdsa.NoSuchPointError:
+                    ppp = []
+
             if public_pair in ppp:
+                SIGNATURE_CACHE.add(public_pair, signature_hash, sig_pair)
                 sig_blob_indices.append(ppb_idx)
                 break
         else:
@@ -0,0 +1,89 @@
+"""
+Cache of valid signatures, so signatures seen before (in the mempool, then in
+a block, or by Tx.sign before and after signing) are not verified again.
+Like the Bitcoin Core sigcache, only valid signatures are stored.
+
+
+The MIT License (MIT)
+
+Copyright (c) 2019 by mkbeh
+
+Permission is hereby granted, free of charge, to any person obtaining a copy
+of this software and associated documentation files (the "Software"), to deal
+in the Software without restriction, including without limitation the rights
+to use, copy, modify, merge, publish, distribute, sublicense, and/or sell
+copies of the Software, and to permit persons to whom the Software is
+furnished to do so, subject to the following conditions:
+
+The above copyright notice and this permission notice shall be included in
+all copies or substantial portions of the Software.
+
+THE SOFTWARE IS PROVIDED "AS IS", WITHOUT WARRANTY OF ANY KIND, EXPRESS OR
+IMPLIED, INCLUDING BUT NOT LIMITED TO THE WARRANTIES OF MERCHANTABILITY,
+FITNESS FOR A PARTICULAR PURPOSE AND NONINFRINGEMENT. IN NO EVENT SHALL THE
+AUTHORS OR COPYRIGHT HOLDERS BE LIABLE FOR ANY CLAIM, DAMAGES OR OTHER
+LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
+OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN
+THE SOFTWARE.
+"""
+
+import threading
+
+from collections import OrderedDict
+
+
+# About 600 bytes per entry.
+DEFAULT_MAX_SIZE = 50000
+
+
+class SignatureCache(object):
+    """
+    Set of (public_pair, signature_hash, sig_pair) known to be valid, holding at
+    most max_size entries (the least recently used ones are dropped). It can be
+    shared by threads. hits and misses count the results of contains.
+    """
+
+    def __init__(self, max_size=DEFAULT_MAX_SIZE):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def contains(self, public_pair, signature_hash, sig_pair):
+        key = (tuple(public_pair), signature_hash, tuple(sig_pair))
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return True
+
+            self.misses += 1
+            return False
+
+    def add(self, public_pair, signature_hash, sig_pair):
+        if self.max_size <= 0:
+            return
+
+        key = (tuple(public_pair), signature_hash, tuple(sig_pair))
+
+        with self._lock:
+            self._entries[key] = None
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+
+# The cache used by op_checksig and op_checkmultisig. Set its max_size to 0 to disable it.
+SIGNATURE_CACHE = SignatureCache()
@@ -84,10 +84,11 @@ class Wallet(GramBitcoinCommon):
         """
         blocks_ago = await bitcointools.calc_blocks_by_days(days_ago)
 
-        async with Blockchain(url=self.url, read_timeout=self.read_timeout) as blockchain:
-            total_blocks = (
-                await blockchain.get_blockchain_info()
-            )['blocks']
+        # Reuse the session (and the responses cache if any) instead of opening new one.
+        blockchain = Blockchain(url=self.url, gram=self._gram or self, read_timeout=self.read_timeout)
+        total_blocks = (
+            await blockchain.get_blockchain_info()
+        )['blocks']
 
         block_height = 1 if full_rescan else total_blocks - blocks_ago
         error = (
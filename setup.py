@@ -25,5 +25,8 @@ setup(
         'ujson==1.35',
         'yarl==1.3.0',
     ],
+    extras_require={
+        'orjson': ['orjson'],
+    },
     packages=find_packages()
 )
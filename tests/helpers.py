@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+import unittest
+from unittest import mock
+
+from aiobitcoin.tools.block import Block
+from aiobitcoin.tools.ecdsa import ecdsa, ellipticcurve
+from aiobitcoin.tools.ecdsa.ellipticcurve import INFINITY
+from aiobitcoin.tools.encoding import double_sha256
+from aiobitcoin.tools.merkle import merkle
+from aiobitcoin.tools.tx.Tx import Tx
+from aiobitcoin.tools.tx.TxIn import TxIn
+from aiobitcoin.tools.tx.TxOut import TxOut
+
+
+def random_bytes(rnd, size):
+    return bytes(rnd.getrandbits(8) for _ in range(size))
+
+
+def random_tx(rnd, segwit=False, tx_class=Tx):
+    """
+    Transaction with random fields, scripts of the sizes which need 1, 3 and 5
+    byte length prefixes, and random witnesses if segwit.
+    """
+    txs_in = [
+        TxIn(random_bytes(rnd, 32), rnd.getrandbits(32), random_bytes(rnd, rnd.choice([0, 107, 300])),
+             rnd.getrandbits(32))
+        for _ in range(rnd.randint(1, 4))
+    ]
+    txs_out = [
+        TxOut(rnd.getrandbits(50), random_bytes(rnd, rnd.choice([0, 25, 260])))
+        for _ in range(rnd.randint(1, 4))
+    ]
+
+    if segwit:
+        for tx_in in txs_in:
+            tx_in.witness = [random_bytes(rnd, rnd.choice([0, 33, 72, 70000])) for _ in range(rnd.randint(0, 3))]
+        txs_in[0].witness = [b'\1']
+
+    return tx_class(rnd.randint(1, 2), txs_in, txs_out, rnd.getrandbits(32))
+
+
+def make_block(txs):
+    block = Block(1, b'\0' * 32, merkle([tx.hash() for tx in txs], double_sha256), 1231006505, 0x1d00ffff, 7)
+    block.set_txs(txs)
+
+    return block
+
+
+def reference_mul(point, e):
+    """Affine double-and-add with Point.__add__ and Point.double."""
+    result = INFINITY
+
+    for bit in bin(e)[2:]:
+        # Point.double can't double points of order 2.
+        result = INFINITY if result != INFINITY and result.y() == 0 else result.double()
+        if bit == '1':
+            result = result + point
+
+    return result
+
+
+class PythonMathTestCase(unittest.TestCase):
+    """Runs without the native libraries, so the Python code paths are tested."""
+
+    def setUp(self):
+        for patcher in (mock.patch.object(ellipticcurve, 'NATIVE_LIBRARY', None),
+                        mock.patch.object(ecdsa, 'LIBSECP256K1', None)):
+            patcher.start()
+            self.addCleanup(patcher.stop)
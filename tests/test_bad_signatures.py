@@ -0,0 +1,71 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from aiobitcoin.tools import ecdsa, encoding
+from aiobitcoin.tools.tx.Tx import Tx, bad_signatures
+from aiobitcoin.tools.tx.TxIn import TxIn
+from aiobitcoin.tools.tx.TxOut import TxOut
+from aiobitcoin.tools.tx.pay_to import build_hash160_lookup, build_p2sh_lookup
+from aiobitcoin.tools.tx.pay_to.ScriptMultisig import ScriptMultisig
+from aiobitcoin.tools.tx.pay_to.ScriptPayToAddress import ScriptPayToAddress
+from aiobitcoin.tools.tx.pay_to.ScriptPayToAddressWit import ScriptPayToAddressWit
+from aiobitcoin.tools.tx.pay_to.ScriptPayToScript import ScriptPayToScript
+from aiobitcoin.tools.tx.script.sigcache import SIGNATURE_CACHE
+
+from helpers import make_block, random_bytes
+
+
+class BadSignaturesTest(unittest.TestCase):
+    def setUp(self):
+        generator = ecdsa.generator_secp256k1
+        rnd = self.rnd = random.Random(29)
+        secret_exponents = [rnd.randrange(1, generator.order()) for _ in range(4)]
+        public_pairs = [ecdsa.public_pair_for_secret_exponent(generator, e) for e in secret_exponents]
+        multisig = ScriptMultisig(2, [encoding.public_pair_to_sec(pair) for pair in public_pairs[1:]]).script()
+
+        self.lookup = build_hash160_lookup(secret_exponents)
+        self.p2sh_lookup = build_p2sh_lookup([multisig])
+        self.scripts = [
+            ScriptPayToAddress(encoding.public_pair_to_hash160_sec(public_pairs[0])).script(),
+            ScriptPayToAddressWit(b'\0', encoding.public_pair_to_hash160_sec(public_pairs[1])).script(),
+            ScriptPayToScript(encoding.hash160(multisig)).script(),
+        ]
+        SIGNATURE_CACHE.clear()
+
+    def make_tx(self, count):
+        txs_in = [TxIn(random_bytes(self.rnd, 32), i, b'', 0xffffffff) for i in range(count)]
+        tx = Tx(1, txs_in, [TxOut(1000, self.scripts[0])], 0)
+        tx.set_unspents([TxOut(2000 + i, self.scripts[i % len(self.scripts)]) for i in range(count)])
+        tx.sign(self.lookup, p2sh_lookup=self.p2sh_lookup)
+
+        return tx
+
+    def test_same_as_one_by_one(self):
+        txs = [self.make_tx(count) for count in (1, 3, 4, 2)]
+        # Broken signatures of each kind of input, and a changed output which breaks all of them.
+        for tx, idx in ((txs[1], 0), (txs[1], 1), (txs[2], 2)):
+            script = bytearray(tx.txs_in[idx].script or tx.txs_in[idx].witness[0])
+            script[10] ^= 1
+            if tx.txs_in[idx].script:
+                tx.txs_in[idx].script = bytes(script)
+            else:
+                tx.txs_in[idx].witness = (bytes(script),) + tuple(tx.txs_in[idx].witness[1:])
+        txs[3].txs_out[0].coin_value += 1
+
+        expected = [(tx, idx) for tx in txs for idx in range(len(tx.txs_in)) if not tx.is_signature_ok(idx)]
+        SIGNATURE_CACHE.clear()
+
+        self.assertEqual(len(expected), 5)
+        self.assertEqual(bad_signatures(txs), expected)
+        self.assertEqual(make_block(txs).verify_signatures(), expected)
+
+    def test_all_valid(self):
+        txs = [self.make_tx(3) for _ in range(3)]
+
+        self.assertEqual(bad_signatures(txs), [])
+        self.assertEqual([tx.bad_signature_count() for tx in txs], [0, 0, 0])
+
+
+if __name__ == '__main__':
+    unittest.main()
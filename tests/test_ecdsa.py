@@ -0,0 +1,88 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from aiobitcoin.tools.ecdsa import ecdsa
+from aiobitcoin.tools.ecdsa.ellipticcurve import Point, INFINITY
+from aiobitcoin.tools.ecdsa.secp256k1 import generator_secp256k1
+
+from helpers import PythonMathTestCase, reference_mul
+
+
+G = generator_secp256k1
+N = G.order()
+
+
+def reference_verify(public_pair, val, signature):
+    """ECDSA verification with affine double-and-add."""
+    r, s = signature
+
+    if not (0 < r < N and 0 < s < N):
+        return False
+
+    c = pow(s, N - 2, N)
+    point = reference_mul(G, val * c % N) + reference_mul(Point(G.curve(), *public_pair), r * c % N)
+
+    return point != INFINITY and point.x() % N == r
+
+
+def signed_items(rnd, count):
+    """(public_pair, val, signature) for every secret exponent, every other signature is invalid."""
+    items = []
+
+    for i in range(count):
+        secret_exponent = rnd.randrange(1, N)
+        public_pair = reference_mul(G, secret_exponent).pair()
+        val = rnd.getrandbits(256)
+        r, s = ecdsa.sign(G, secret_exponent, val)
+
+        if i % 2:
+            val ^= 1
+
+        items.append((public_pair, val, (r, s)))
+
+    return items
+
+
+class VerifyTest(PythonMathTestCase):
+    def test_same_as_reference(self):
+        for public_pair, val, signature in signed_items(random.Random(23), 10):
+            self.assertEqual(ecdsa.verify(G, public_pair, val, signature),
+                             reference_verify(public_pair, val, signature))
+
+    def test_valid_and_invalid(self):
+        (public_pair, val, (r, s)), (other_pair, _, _) = signed_items(random.Random(24), 2)
+
+        self.assertTrue(ecdsa.verify(G, public_pair, val, (r, s)))
+        self.assertTrue(ecdsa.verify(G, public_pair, val, (r, N - s)))
+        self.assertFalse(ecdsa.verify(G, other_pair, val, (r, s)))
+        self.assertFalse(ecdsa.verify(G, public_pair, val, (r, s + 1)))
+
+        for signature in ((0, s), (r, 0), (N, s), (r, N)):
+            self.assertFalse(ecdsa.verify(G, public_pair, val, signature))
+
+
+class VerifyManyTest(PythonMathTestCase):
+    def setUp(self):
+        super(VerifyManyTest, self).setUp()
+        self.items = signed_items(random.Random(28), 8)
+        (public_pair, val, (r, s)) = self.items[0]
+        self.items += [
+            (public_pair, val, (0, s)),
+            (public_pair, val, (r, N)),
+            ((public_pair[0], public_pair[1] + 1), val, (r, s)),
+        ]
+
+    def test_same_as_verify(self):
+        expected = [reference_verify(*item) for item in self.items[:-1]] + [False]
+
+        self.assertEqual(ecdsa.verify_many(G, self.items), expected)
+        self.assertEqual(expected[:8], [True, False] * 4)
+
+    def test_iterable_and_empty(self):
+        self.assertEqual(ecdsa.verify_many(G, iter(self.items[:2])), [True, False])
+        self.assertEqual(ecdsa.verify_many(G, []), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,199 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from aiobitcoin.tools.ecdsa import ecdsa
+from aiobitcoin.tools.ecdsa.ellipticcurve import (
+    CurveFp, FixedBasePoint, Point, INFINITY, JACOBIAN_INFINITY, jacobian_add, jacobian_add_affine, jacobian_double,
+    jacobian_mul_sum, jacobian_to_affine, jacobian_to_affine_many, wnaf)
+from aiobitcoin.tools.ecdsa.secp256k1 import generator_secp256k1
+
+from helpers import PythonMathTestCase, reference_mul
+
+
+G = generator_secp256k1
+N = G.order()
+P = G.curve().p()
+# secp256k1 without the endomorphism, so points are multiplied with plain wNAF.
+CURVE_NO_ENDOMORPHISM = CurveFp(P, G.curve().a(), G.curve().b())
+# Curve with a != 0 from X9.62, its generator has order 7.
+SMALL_CURVE = CurveFp(23, 1, 1)
+
+
+def to_point(curve, X, Y, Z):
+    if not Z:
+        return INFINITY
+
+    return Point(curve, *jacobian_to_affine(X, Y, Z, curve.p()))
+
+
+def random_point(rnd, curve=G.curve()):
+    # Multiples of the generator, computed by the reference.
+    return Point(curve, *reference_mul(G, rnd.randrange(1, N)).pair())
+
+
+class JacobianTest(PythonMathTestCase):
+    def test_add_and_double(self):
+        rnd = random.Random(15)
+        curve = G.curve()
+
+        for _ in range(20):
+            p1, p2 = random_point(rnd), random_point(rnd)
+            z1, z2 = rnd.randrange(1, P), rnd.randrange(1, P)
+            # The same points with random Z.
+            J1 = (p1.x() * z1 * z1 % P, p1.y() * z1 * z1 * z1 % P, z1)
+            J2 = (p2.x() * z2 * z2 % P, p2.y() * z2 * z2 * z2 % P, z2)
+
+            self.assertEqual(to_point(curve, *jacobian_add(*J1, *J2, p=P, a=0)), p1 + p2)
+            self.assertEqual(to_point(curve, *jacobian_add_affine(*J1, *p2.pair(), p=P, a=0)), p1 + p2)
+            self.assertEqual(to_point(curve, *jacobian_double(*J1, p=P, a=0)), p1.double())
+            self.assertEqual(to_point(curve, *jacobian_add(*J1, *J1, p=P, a=0)), p1.double())
+            self.assertEqual(to_point(curve, *jacobian_add_affine(*J1, *p1.pair(), p=P, a=0)), p1.double())
+            self.assertEqual(jacobian_add(*J1, *JACOBIAN_INFINITY, p=P, a=0), J1)
+            self.assertEqual(jacobian_add(*JACOBIAN_INFINITY, *J2, p=P, a=0), J2)
+            self.assertEqual(jacobian_add_affine(*JACOBIAN_INFINITY, *p2.pair(), p=P, a=0), p2.pair() + (1,))
+
+    def test_add_opposite(self):
+        point = random_point(random.Random(16))
+        X, Y, Z = point.x(), point.y(), 1
+
+        self.assertFalse(jacobian_add(X, Y, Z, X, P - Y, 1, p=P, a=0)[2])
+        self.assertFalse(jacobian_add_affine(X, Y, Z, X, P - Y, p=P, a=0)[2])
+
+    def test_to_affine_many(self):
+        rnd = random.Random(17)
+        points = [random_point(rnd) for _ in range(5)]
+        jacobian = [(p.x() * 4 % P, p.y() * 8 % P, 2) for p in points]
+        jacobian.insert(2, JACOBIAN_INFINITY)
+
+        pairs = jacobian_to_affine_many(jacobian, P)
+
+        self.assertEqual(pairs[2], None)
+        self.assertEqual(pairs[:2] + pairs[3:], [p.pair() for p in points])
+
+    def test_mul(self):
+        rnd = random.Random(18)
+
+        for _ in range(20):
+            point = random_point(rnd, CURVE_NO_ENDOMORPHISM)
+            e = rnd.randrange(1, N)
+
+            self.assertEqual(point * e, reference_mul(point, e))
+
+    def test_mul_small_curve(self):
+        # a != 0 and every multiple, infinity included.
+        g = Point(SMALL_CURVE, 13, 7, 7)
+
+        for e in range(1, 30):
+            self.assertEqual(g * e, reference_mul(g, e % 7), e)
+            self.assertEqual(Point(SMALL_CURVE, 3, 10) * e, reference_mul(Point(SMALL_CURVE, 3, 10), e), e)
+
+    def test_mul_order(self):
+        point = Point(CURVE_NO_ENDOMORPHISM, *G.pair(), N)
+
+        self.assertEqual(point * N, INFINITY)
+        self.assertEqual(point * (N - 1), Point(CURVE_NO_ENDOMORPHISM, G.x(), P - G.y()))
+        self.assertEqual(point * (N + 2), point.double())
+
+
+class FixedBaseTest(PythonMathTestCase):
+    def test_generator(self):
+        rnd = random.Random(19)
+        scalars = [1, 2, 15, 16, 17, 1 << 252, (1 << 256) - 1, N - 1, N + 3]
+        scalars += [rnd.randrange(1, N) for _ in range(20)]
+
+        for e in scalars:
+            self.assertEqual(G * e, reference_mul(G, e % N), e)
+
+        self.assertEqual(G * N, INFINITY)
+
+    def test_scalar_out_of_table(self):
+        # The table covers scalars below 2^256, longer ones are multiplied without it.
+        e = (1 << 300) + 12345
+        self.assertEqual(to_point(G.curve(), *G._mul_jacobian(e)), reference_mul(G, e % N))
+
+    def test_small_curve(self):
+        g = FixedBasePoint(SMALL_CURVE, 13, 7, 7)
+
+        for e in range(1, 30):
+            self.assertEqual(g * e, reference_mul(g, e % 7), e)
+
+    def test_public_pairs_for_secret_exponents(self):
+        rnd = random.Random(20)
+        secret_exponents = [rnd.randrange(1, N) for _ in range(10)] + [0, N, N + 1]
+        expected = [reference_mul(G, e % N).pair() for e in secret_exponents]
+
+        self.assertEqual(ecdsa.public_pairs_for_secret_exponents(G, secret_exponents), expected)
+        self.assertEqual(ecdsa.public_pair_for_secret_exponent(G, secret_exponents[0]), expected[0])
+
+
+class WNAFTest(PythonMathTestCase):
+    def test_digits(self):
+        rnd = random.Random(21)
+
+        for width in (2, 5, 8):
+            for e in [1, 7, -7, 1 << 100] + [rnd.randrange(-N, N) for _ in range(50)]:
+                digits = wnaf(e, width)
+
+                self.assertEqual(sum(d << i for i, d in enumerate(digits)), e)
+
+                for i, d in enumerate(digits):
+                    if d:
+                        self.assertEqual(d % 2, 1)
+                        self.assertLess(abs(d), 1 << (width - 1))
+                        self.assertFalse(any(digits[i + 1:i + width]))
+
+    def test_mul_sum(self):
+        # u1 * G + u2 * Q with shared doublings, like verify, with and without the endomorphism.
+        rnd = random.Random(22)
+
+        for curve in (G.curve(), CURVE_NO_ENDOMORPHISM):
+            g = FixedBasePoint(curve, *G.pair(), N)
+
+            for _ in range(10):
+                q = random_point(rnd, curve)
+                u1, u2 = rnd.randrange(1, N), rnd.randrange(1, N)
+                expected = reference_mul(g, u1) + reference_mul(q, u2)
+
+                self.assertEqual(to_point(curve, *jacobian_mul_sum([(u1, g), (u2, q)], P, 0)), expected)
+
+            self.assertEqual(to_point(curve, *jacobian_mul_sum([(5, g), (N - 5, g)], P, 0)), INFINITY)
+            self.assertEqual(to_point(curve, *jacobian_mul_sum([(0, g), (3, g)], P, 0)), reference_mul(g, 3))
+            self.assertEqual(jacobian_mul_sum([], P, 0)[2], 0)
+
+
+class EndomorphismTest(PythonMathTestCase):
+    endomorphism = G.curve().endomorphism()
+
+    def test_split(self):
+        rnd = random.Random(25)
+        lambda_ = self.endomorphism.lambda_
+
+        for k in [0, 1, N - 1, N, N + 1, lambda_] + [rnd.randrange(N) for _ in range(200)]:
+            k1, k2 = self.endomorphism.split(k)
+
+            self.assertEqual((k1 + k2 * lambda_) % N, k % N)
+            self.assertLess(abs(k1).bit_length(), 130)
+            self.assertLess(abs(k2).bit_length(), 130)
+
+    def test_map_is_mul_by_lambda(self):
+        point = random_point(random.Random(26))
+        beta = self.endomorphism.beta
+
+        self.assertEqual(Point(G.curve(), beta * point.x() % P, point.y()),
+                         reference_mul(point, self.endomorphism.lambda_))
+
+    def test_mul(self):
+        rnd = random.Random(27)
+        scalars = [1, 2, N - 1, self.endomorphism.lambda_, N - self.endomorphism.lambda_]
+        scalars += [rnd.randrange(1, N) for _ in range(20)]
+
+        for e in scalars:
+            point = random_point(rnd)
+
+            self.assertEqual(point * e, reference_mul(point, e), e)
+            self.assertEqual(to_point(G.curve(), *jacobian_mul_sum([(e, G)], P, 0)), reference_mul(G, e), e)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,119 @@
+# -*- coding: utf-8 -*-
+import asyncio
+import unittest
+
+from aiobitcoin.bitcoinerrors import RPCError, InvalidAddress
+from aiobitcoin.grambitcoin import GramBitcoin
+
+
+def run(coro):
+    loop = asyncio.new_event_loop()
+
+    try:
+        return loop.run_until_complete(coro)
+    finally:
+        loop.close()
+
+
+class FakeGram(GramBitcoin):
+    """
+    Answers batch requests in the reversed order, like the daemon is allowed to.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(url='http://127.0.0.1:8332', **kwargs)
+        self.requests = []
+
+    @staticmethod
+    def _answer(request):
+        method, params = request['method'], request['params']
+
+        if method == 'getblockhash' and params[0] < 0:
+            return {'result': None, 'error': {'code': -8, 'message': 'Block height out of range'}}
+        if method == 'validateaddress':
+            return {'result': None, 'error': {'code': -5, 'message': 'Invalid address'}}
+
+        return {'result': [method] + list(params), 'error': None}
+
+    async def _post(self, data, raw=False):
+        self.requests.append(data)
+
+        if not isinstance(data, list):
+            return dict(self._answer(data), id=data['id'])
+
+        return [dict(self._answer(request), id=request['id']) for request in reversed(data)]
+
+
+class CallBatchTest(unittest.TestCase):
+    def test_responses_in_order_of_calls(self):
+        gram = FakeGram(max_batch_size=3)
+        calls = [('getblockhash', [height]) for height in range(7)]
+        responses = run(gram.call_batch(calls))
+
+        self.assertEqual([response['result'] for response in responses],
+                         [['getblockhash', height] for height in range(7)])
+        self.assertEqual([len(request) for request in gram.requests], [3, 3, 1])
+
+    def test_max_batch_size_argument(self):
+        gram = FakeGram()
+        run(gram.call_batch([('getblockcount', [])] * 5, max_batch_size=2))
+
+        self.assertEqual([len(request) for request in gram.requests], [2, 2, 1])
+
+    def test_rejected_batch(self):
+        class RejectingGram(FakeGram):
+            async def _post(self, data, raw=False):
+                return {'result': None, 'error': {'code': -32700, 'message': 'Parse error'}, 'id': None}
+
+        with self.assertRaises(RPCError) as cm:
+            run(RejectingGram().call_batch([('getblockcount', [])]))
+
+        self.assertEqual(cm.exception.code, -32700)
+
+
+class RPCBatchTest(unittest.TestCase):
+    def test_results_and_errors(self):
+        gram = FakeGram(max_batch_size=2)
+
+        async def main():
+            async with gram.batch() as batch:
+                futures = [
+                    batch.add('getblockhash', 5),
+                    batch.add('getblockhash', -1),
+                    batch.add('validateaddress', 'x'),
+                    batch.add('getblockcount'),
+                ]
+
+            return futures
+
+        block_hash, out_of_range, invalid_address, block_count = run(main())
+
+        self.assertEqual(block_hash.result(), ['getblockhash', 5])
+        self.assertEqual(block_count.result(), ['getblockcount'])
+
+        with self.assertRaises(RPCError) as cm:
+            out_of_range.result()
+        self.assertEqual(cm.exception.code, -8)
+        self.assertEqual(cm.exception.message, 'Block height out of range')
+
+        with self.assertRaises(InvalidAddress) as cm:
+            invalid_address.result()
+        self.assertEqual(cm.exception.code, -5)
+
+    def test_futures_cancelled_on_error_in_context(self):
+        gram = FakeGram()
+
+        async def main():
+            try:
+                async with gram.batch() as batch:
+                    future = batch.add('getblockcount')
+                    raise ValueError
+            except ValueError:
+                return future
+
+        self.assertTrue(run(main()).cancelled())
+        self.assertEqual(gram.requests, [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+import json
+import unittest
+
+from aiobitcoin.jsonstream import JSONArrayStream
+
+
+TXS = [{'txid': 'a' * 64, 'vin': [{'coinbase': '[{,\\"]}'}], 'vout': [1.5, None, True]}, 's', 1, [2, [3]], None, {}]
+
+
+def make_body(result, error=None):
+    return json.dumps({'result': result, 'error': error, 'id': 1}).encode()
+
+
+def feed_chunks(body, size, key='tx'):
+    parser = JSONArrayStream(key)
+    items = []
+
+    for i in range(0, len(body), size):
+        items += parser.feed(body[i:i + size])
+
+    return parser, items
+
+
+class JSONArrayStreamTest(unittest.TestCase):
+    body = make_body({'hash': 'h', 'nested': {'tx': [0]}, 'key': 'tx', 'tx': TXS, 'time': 5})
+
+    def test_every_chunk_size(self):
+        for size in range(1, len(self.body) + 1):
+            parser, items = feed_chunks(self.body, size)
+
+            self.assertEqual(items, TXS, size)
+            self.assertTrue(parser.found)
+            self.assertTrue(parser.finished)
+
+    def test_every_split_point(self):
+        for i in range(len(self.body) + 1):
+            parser = JSONArrayStream('tx')
+            items = parser.feed(self.body[:i]) + parser.feed(self.body[i:])
+
+            self.assertEqual(items, TXS, i)
+
+    def test_items_are_dropped_from_buffer(self):
+        parser = JSONArrayStream('tx')
+        parser.feed(make_body({'tx': ['x' * 1000] * 10})[:-20])
+
+        self.assertLess(len(parser._buf), 100)
+
+    def test_empty_array(self):
+        parser, items = feed_chunks(make_body({'tx': [], 'time': 5}), 3)
+
+        self.assertEqual(items, [])
+        self.assertTrue(parser.finished)
+
+    def test_error_response(self):
+        error = {'code': -5, 'message': 'Block not found'}
+        parser, items = feed_chunks(make_body(None, error), 4)
+
+        self.assertEqual(items, [])
+        self.assertFalse(parser.found)
+        self.assertEqual(parser.body()['error'], error)
+
+
+if __name__ == '__main__':
+    unittest.main()
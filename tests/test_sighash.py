@@ -0,0 +1,244 @@
+# -*- coding: utf-8 -*-
+import io
+import random
+import struct
+import unittest
+
+from aiobitcoin.tools import ecdsa, encoding
+from aiobitcoin.tools.serialize import h2b
+from aiobitcoin.tools.serialize.bitcoin_streamer import stream_bc_string
+from aiobitcoin.tools.tx.Tx import Tx
+from aiobitcoin.tools.tx.TxIn import TxIn
+from aiobitcoin.tools.tx.TxOut import TxOut
+from aiobitcoin.tools.tx.pay_to import build_hash160_lookup
+from aiobitcoin.tools.tx.pay_to.ScriptPayToAddress import ScriptPayToAddress
+from aiobitcoin.tools.tx.pay_to.ScriptPayToAddressWit import ScriptPayToAddressWit
+
+from helpers import random_bytes, random_tx
+
+
+HASH_TYPES = [base | anyone_can_pay for base in (1, 2, 3) for anyone_can_pay in (0, 0x80)]
+
+
+def bip143_signature_hash(tx, script, tx_in_idx, hash_type):
+    """BIP143 signature hash computed from scratch."""
+    base_type = hash_type & 0x1f
+    anyone_can_pay = hash_type & 0x80
+    zero = b'\0' * 32
+    hash_prevouts = hash_sequence = hash_outputs = zero
+
+    if not anyone_can_pay:
+        hash_prevouts = encoding.double_sha256(b''.join(
+            t.previous_hash + struct.pack('<L', t.previous_index) for t in tx.txs_in))
+
+    if not anyone_can_pay and base_type not in (2, 3):
+        hash_sequence = encoding.double_sha256(b''.join(struct.pack('<L', t.sequence) for t in tx.txs_in))
+
+    def outputs_bin(txs_out):
+        f = io.BytesIO()
+        for tx_out in txs_out:
+            f.write(struct.pack('<Q', tx_out.coin_value))
+            stream_bc_string(f, tx_out.script)
+
+        return f.getvalue()
+
+    if base_type not in (2, 3):
+        hash_outputs = encoding.double_sha256(outputs_bin(tx.txs_out))
+    elif base_type == 3 and tx_in_idx < len(tx.txs_out):
+        hash_outputs = encoding.double_sha256(outputs_bin(tx.txs_out[tx_in_idx:tx_in_idx + 1]))
+
+    tx_in = tx.txs_in[tx_in_idx]
+    f = io.BytesIO()
+    f.write(struct.pack('<L', tx.version) + hash_prevouts + hash_sequence)
+    f.write(tx_in.previous_hash + struct.pack('<L', tx_in.previous_index))
+    stream_bc_string(f, script)
+    f.write(struct.pack('<QL', tx.unspents[tx_in_idx].coin_value, tx_in.sequence))
+    f.write(hash_outputs + struct.pack('<LL', tx.lock_time, hash_type))
+
+    return encoding.from_bytes_32(encoding.double_sha256(f.getvalue()))
+
+
+def legacy_signature_hash(tx, script, tx_in_idx, hash_type):
+    """Legacy signature hash computed from a temporary tx, like the original implementation."""
+    base_type = hash_type & 0x1f
+
+    if base_type == 3 and tx_in_idx >= len(tx.txs_out):
+        return 1 << 248
+
+    txs_in = [TxIn(t.previous_hash, t.previous_index, script if i == tx_in_idx else b'', t.sequence)
+              for i, t in enumerate(tx.txs_in)]
+    txs_out = tx.txs_out
+
+    if base_type in (2, 3):
+        for i, tx_in in enumerate(txs_in):
+            if i != tx_in_idx:
+                tx_in.sequence = 0
+
+    if base_type == 2:
+        txs_out = []
+    elif base_type == 3:
+        txs_out = [TxOut(0xffffffffffffffff, b'')] * tx_in_idx + [tx.txs_out[tx_in_idx]]
+
+    if hash_type & 0x80:
+        txs_in = [txs_in[tx_in_idx]]
+
+    preimage = Tx(tx.version, txs_in, txs_out, tx.lock_time).as_bin() + struct.pack('<L', hash_type)
+
+    return encoding.from_bytes_32(encoding.double_sha256(preimage))
+
+
+def p2pkh_script(rnd):
+    return b'\x76\xa9\x14' + random_bytes(rnd, 20) + b'\x88\xac'
+
+
+def random_segwit_tx(rnd):
+    tx = random_tx(rnd, segwit=True)
+    # Standard output scripts, hash_outputs prefixes scripts of 76 bytes or more as pushes, not compact sizes.
+    for tx_out in tx.txs_out:
+        tx_out.script = random_bytes(rnd, rnd.choice([22, 25, 34]))
+    tx.set_unspents([TxOut(rnd.getrandbits(40), random_bytes(rnd, 22)) for _ in tx.txs_in])
+
+    return tx
+
+
+class BIP143Test(unittest.TestCase):
+    def test_native_p2wpkh_vector(self):
+        # Native P2WPKH example from BIP143, the second input.
+        tx = Tx.from_hex(
+            '0100000002fff7f7881a8099afa6940d42d1e7f6362bec38171ea3edf433541db4e4ad969f0000000000eeffffff'
+            'ef51e1b804cc89d182d279655c3aa89e815b1b309fe287d9b2b55d57b90ec68a0100000000ffffffff02202cb206'
+            '000000001976a9148280b37df378db99f66f85c95a783a76ac7a6d5988ac9093510d000000001976a9143bde42db'
+            'ee7e4dbe6a21b2d50ce2f0167faa815988ac11000000')
+        tx.set_unspents([TxOut(625000000, b''), TxOut(600000000, b'')])
+        script = h2b('76a9141d0f172a0ecb48aee1be1f2687d2963ae33f71a188ac')
+
+        self.assertEqual(
+            tx.signature_for_hash_type_segwit(script, 1, 1),
+            encoding.from_bytes_32(h2b('c37af31116d1b27caf68aae9e3ac82f1477929014d5b917657d0eb49478cb670')))
+
+    def test_same_as_reference(self):
+        rnd = random.Random(13)
+
+        for _ in range(20):
+            tx = random_segwit_tx(rnd)
+            script = random_bytes(rnd, 25)
+
+            for tx_in_idx in range(len(tx.txs_in)):
+                for hash_type in HASH_TYPES:
+                    self.assertEqual(tx.signature_for_hash_type_segwit(script, tx_in_idx, hash_type),
+                                     bip143_signature_hash(tx, script, tx_in_idx, hash_type))
+
+    def test_midstates_follow_changes(self):
+        rnd = random.Random(14)
+        changes = [
+            lambda tx: setattr(tx.txs_in[0], 'sequence', 0xfffffffd),
+            lambda tx: setattr(tx.txs_in[-1], 'previous_index', 5),
+            lambda tx: setattr(tx.txs_out[0], 'coin_value', 1),
+            lambda tx: setattr(tx.txs_out[-1], 'script', b'\x6a'),
+            lambda tx: tx.txs_out.append(TxOut(2, b'\x51')),
+            lambda tx: setattr(tx, 'txs_in', tx.txs_in[:1]),
+        ]
+
+        for change in changes:
+            tx = random_segwit_tx(rnd)
+            script = random_bytes(rnd, 25)
+            tx.signature_for_hash_type_segwit(script, 0, 1)
+            change(tx)
+
+            for hash_type in HASH_TYPES:
+                self.assertEqual(tx.signature_for_hash_type_segwit(script, 0, hash_type),
+                                 bip143_signature_hash(tx, script, 0, hash_type))
+
+
+class LegacySignatureHashTest(unittest.TestCase):
+    def test_same_as_reference(self):
+        rnd = random.Random(16)
+
+        for _ in range(20):
+            tx = random_tx(rnd)
+            script = p2pkh_script(rnd)
+
+            for tx_in_idx in range(len(tx.txs_in)):
+                for hash_type in HASH_TYPES:
+                    self.assertEqual(tx.signature_hash(script, tx_in_idx, hash_type),
+                                     legacy_signature_hash(tx, script, tx_in_idx, hash_type))
+
+    def test_code_separators_removed(self):
+        tx = random_tx(random.Random(17))
+        script = p2pkh_script(random.Random(18))
+
+        self.assertEqual(tx.signature_hash(b'\xab' + script + b'\xab', 0, 1),
+                         legacy_signature_hash(tx, script, 0, 1))
+
+    def test_memoized_values_follow_changes(self):
+        rnd = random.Random(19)
+        changes = [
+            lambda tx: setattr(tx.txs_in[-1], 'sequence', 0xfffffffd),
+            lambda tx: setattr(tx.txs_in[-1], 'previous_hash', b'\1' * 32),
+            lambda tx: setattr(tx.txs_out[0], 'coin_value', 1),
+            lambda tx: setattr(tx.txs_out[-1], 'script', b'\x6a'),
+            lambda tx: tx.txs_in.append(TxIn(b'\2' * 32, 0, b'', 0)),
+            lambda tx: setattr(tx, 'txs_out', tx.txs_out[:1]),
+        ]
+
+        for change in changes:
+            tx = random_tx(rnd)
+            script = p2pkh_script(rnd)
+            tx.signature_hash(script, 0, 1)
+            tx.signature_hash(script, 0, 2)
+            change(tx)
+
+            for hash_type in HASH_TYPES:
+                self.assertEqual(tx.signature_hash(script, 0, hash_type),
+                                 legacy_signature_hash(tx, script, 0, hash_type))
+
+
+class ResignTest(unittest.TestCase):
+    """Signatures made again after changing the tx in place (e.g. bumping the fee) are valid."""
+
+    def setUp(self):
+        generator = ecdsa.generator_secp256k1
+        rnd = random.Random(15)
+        secret_exponents = [rnd.randrange(1, generator.order()) for _ in range(2)]
+        self.lookup = build_hash160_lookup(secret_exponents)
+        self.hash160s = [
+            encoding.public_pair_to_hash160_sec(ecdsa.public_pair_for_secret_exponent(generator, secret_exponent))
+            for secret_exponent in secret_exponents
+        ]
+        self.rnd = rnd
+
+    def make_tx(self, scripts):
+        txs_in = [TxIn(random_bytes(self.rnd, 32), i, b'', 0xfffffffe) for i in range(len(scripts))]
+        txs_out = [TxOut(5000, scripts[0]), TxOut(4000, scripts[-1])]
+        tx = Tx(1, txs_in, txs_out, 0)
+        tx.set_unspents([TxOut(3000 + i, script) for i, script in enumerate(scripts)])
+        tx.sign(self.lookup)
+        self.assertEqual(tx.bad_signature_count(), 0)
+
+        return tx
+
+    def check_resign(self, tx):
+        for tx_in in tx.txs_in:
+            tx_in.sequence = 0xfffffffd
+        tx.txs_out[0].coin_value -= 100
+
+        self.assertEqual(tx.bad_signature_count(), len(tx.txs_in))
+
+        tx.sign(self.lookup)
+        parsed = Tx.from_hex(tx.as_hex())
+        parsed.set_unspents(tx.unspents)
+
+        self.assertEqual(tx.bad_signature_count(), 0)
+        self.assertEqual(parsed.bad_signature_count(), 0)
+
+    def test_segwit(self):
+        script = ScriptPayToAddressWit(b'\0', self.hash160s[0]).script()
+        self.check_resign(self.make_tx([script] * 3))
+
+    def test_legacy(self):
+        scripts = [ScriptPayToAddress(hash160).script() for hash160 in self.hash160s]
+        self.check_resign(self.make_tx(scripts * 2))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,104 @@
+# -*- coding: utf-8 -*-
+import random
+import unittest
+
+from aiobitcoin.tools.tx.LazyTx import LazyTx
+from aiobitcoin.tools.tx.Tx import Tx
+from aiobitcoin.tools.tx.TxIn import TxIn
+from aiobitcoin.tools.tx.TxOut import TxOut
+
+from helpers import random_tx
+
+
+def fresh_copy(tx):
+    # Nothing is memoized in a new Tx, so it's computed from the current fields.
+    txs_in = [TxIn(t.previous_hash, t.previous_index, t.script, t.sequence) for t in tx.txs_in]
+    for tx_in, t in zip(txs_in, tx.txs_in):
+        tx_in.witness = t.witness
+    txs_out = [TxOut(t.coin_value, t.script) for t in tx.txs_out]
+
+    return Tx(tx.version, txs_in, txs_out, tx.lock_time)
+
+
+def memoized_values(tx):
+    return (tx.as_bin(), tx.as_bin(include_witness_data=False), tx.hash(), tx.w_hash(), tx.id(), tx.w_id(),
+            tx.size(), tx.weight())
+
+
+def set_attr(name, value, index=0, txs='txs_in'):
+    def change(tx):
+        setattr(getattr(tx, txs)[index], name, value)
+
+    return change
+
+
+MUTATIONS = {
+    'script': set_attr('script', b'\x51'),
+    'witness': set_attr('witness', (b'\2' * 72, b'\3' * 33)),
+    'set_witness': lambda tx: tx.set_witness(0, [b'\4' * 20]),
+    'sequence': set_attr('sequence', 0xfffffffd, index=-1),
+    'previous_hash': set_attr('previous_hash', b'\5' * 32),
+    'previous_index': set_attr('previous_index', 7),
+    'coin_value': set_attr('coin_value', 12345, index=-1, txs='txs_out'),
+    'out_script': set_attr('script', b'\x6a', txs='txs_out'),
+    'append_tx_in': lambda tx: tx.txs_in.append(TxIn(b'\6' * 32, 1, b'', 0)),
+    'pop_tx_out': lambda tx: tx.txs_out.pop() if len(tx.txs_out) > 1 else tx.txs_out.append(TxOut(1, b'')),
+    'new_txs_out': lambda tx: setattr(tx, 'txs_out', [TxOut(2, b'\x51')]),
+    'version': lambda tx: setattr(tx, 'version', tx.version + 1),
+    'lock_time': lambda tx: setattr(tx, 'lock_time', tx.lock_time ^ 1),
+}
+
+
+class CacheInvalidationTest(unittest.TestCase):
+    def check_mutations(self, make_tx):
+        rnd = random.Random(12)
+
+        for name, mutate in sorted(MUTATIONS.items()):
+            for segwit in (False, True):
+                tx = make_tx(random_tx(rnd, segwit=segwit))
+                before = memoized_values(tx)
+                mutate(tx)
+                after = memoized_values(tx)
+
+                self.assertNotEqual(after, before, name)
+                self.assertEqual(after, memoized_values(fresh_copy(tx)), name)
+
+    def test_tx(self):
+        self.check_mutations(lambda tx: tx)
+
+    def test_parsed_tx(self):
+        self.check_mutations(lambda tx: Tx.from_bin(tx.as_bin()))
+
+    def test_lazy_tx(self):
+        self.check_mutations(lambda tx: LazyTx.from_bin(tx.as_bin()))
+
+    def test_reading_lazy_tx_keeps_values(self):
+        blob = random_tx(random.Random(13), segwit=True).as_bin()
+        tx = LazyTx.from_bin(blob)
+        before = memoized_values(tx)
+        [tx_in.witness for tx_in in tx.txs_in]
+        [tx_out.script for tx_out in tx.txs_out]
+
+        self.assertEqual(memoized_values(tx), before)
+        self.assertIs(tx.as_bin(), blob)
+
+    def test_change_of_other_tx(self):
+        rnd = random.Random(14)
+        tx, other = random_tx(rnd), random_tx(rnd)
+        before = memoized_values(tx)
+        other.txs_in[0].script = b''
+
+        self.assertEqual(memoized_values(tx), before)
+
+    def test_reordered_in_place(self):
+        tx = random_tx(random.Random(15))
+        tx.txs_out.append(TxOut(3, b'\x51'))
+        tx.as_bin()
+        tx.txs_out.reverse()
+        tx.invalidate_caches()
+
+        self.assertEqual(memoized_values(tx), memoized_values(fresh_copy(tx)))
+
+
+if __name__ == '__main__':
+    unittest.main()
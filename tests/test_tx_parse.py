@@ -0,0 +1,74 @@
+# -*- coding: utf-8 -*-
+import io
+import random
+import struct
+import unittest
+
+from aiobitcoin.tools.block import Block
+from aiobitcoin.tools.tx.Tx import Tx
+
+from helpers import make_block, random_tx
+
+
+def fields(tx):
+    return (
+        tx.version, tx.lock_time,
+        [(t.previous_hash, t.previous_index, t.script, t.sequence, list(t.witness)) for t in tx.txs_in],
+        [(t.coin_value, t.script) for t in tx.txs_out],
+    )
+
+
+class ParseFromBufferTest(unittest.TestCase):
+    def setUp(self):
+        rnd = random.Random(10)
+        self.txs = [random_tx(rnd, segwit=i % 2 == 1) for i in range(40)]
+
+    def test_same_as_parse(self):
+        for tx in self.txs:
+            blob = tx.as_bin()
+            parsed = Tx.parse(io.BytesIO(blob))
+            from_buffer, offset = Tx.parse_from_buffer(blob)
+
+            self.assertEqual(offset, len(blob))
+            self.assertEqual(fields(from_buffer), fields(parsed))
+            self.assertEqual(from_buffer.as_bin(), blob)
+            self.assertEqual(from_buffer.as_bin(include_witness_data=False), parsed.as_bin(include_witness_data=False))
+            self.assertEqual(from_buffer.id(), parsed.id())
+            self.assertEqual(from_buffer.w_id(), parsed.w_id())
+
+    def test_memoryview_at_offset(self):
+        blobs = [tx.as_bin() for tx in self.txs]
+        data = memoryview(b'junk' + b''.join(blobs))
+        offset = 4
+
+        for tx, blob in zip(self.txs, blobs):
+            parsed, end = Tx.parse_from_buffer(data, offset)
+
+            self.assertEqual(end - offset, len(blob))
+            self.assertEqual(fields(parsed), fields(tx))
+            self.assertIs(type(parsed.as_bin()), bytes)
+            offset = end
+
+    def test_truncated(self):
+        blob = self.txs[1].as_bin()
+
+        for size in (0, 3, 10, 50, len(blob) - 1):
+            with self.assertRaises((struct.error, IndexError)):
+                Tx.parse_from_buffer(blob[:size])
+
+    def test_block(self):
+        block = make_block(self.txs)
+        blob = block.as_bin()
+        parsed = Block.parse(io.BytesIO(blob), include_offsets=True)
+        from_buffer = Block.parse_from_buffer(blob, include_offsets=True)
+
+        self.assertEqual(from_buffer.id(), parsed.id())
+        self.assertEqual(from_buffer.previous_block_hash, parsed.previous_block_hash)
+        self.assertEqual(from_buffer.merkle_root, parsed.merkle_root)
+        self.assertEqual([fields(tx) for tx in from_buffer.txs], [fields(tx) for tx in parsed.txs])
+        self.assertEqual([tx.offset_in_block for tx in from_buffer.txs], [tx.offset_in_block for tx in parsed.txs])
+        self.assertEqual(from_buffer.as_bin(), blob)
+
+
+if __name__ == '__main__':
+    unittest.main()